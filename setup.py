@@ -1,65 +1,97 @@
 import os
+import re
+import sys
+from pathlib import Path
+
 import setuptools
-import siswrapper._version as _version
 
-version_date = _version.__version__
-version = version_date.split(" ")[1]
+
+def get_version():
+    """
+    Returns the version number stored inside siswrapper/_version.py.
+
+    The file is parsed instead of imported so that the package
+    doesn't get executed just to read its metadata.
+    :return str version: version number (without the date)
+    """
+    version_path = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'siswrapper', '_version.py')
+
+    with open(version_path, encoding='utf-8') as f:
+        version_file = f.read()
+
+    match = re.search(r'^__version__\s*=\s*["\'](.+?)["\']', version_file, re.M)
+    if match is None:
+        raise Exception("__version__ not found inside siswrapper/_version.py")
+
+    # __version__ is "<date> <version number>"
+    return match.group(1).split(" ")[1]
 
 
 def get_readme():
     """
     Returns README.md content.
-    :return str long_description: README.md content
+
+    Minimal source checkouts may not ship the README:
+    in that case the long description is left empty.
+    :return str long_description: README.md content (empty string if README.md doesn't exist)
     """
-    long_description = ""
-    this_directory = os.path.abspath(os.path.dirname(__file__))
+    readme_path = Path(__file__).resolve().parent / 'README.md'
+
+    if not readme_path.is_file():
+        return ''
+
+    return readme_path.read_text(encoding='utf-8')
+
+
+def needs_readme():
+    """
+    Returns True if the current setup.py command publishes the long description.
+    :return bool: True if README.md has to be read
+    """
+    return any(command in sys.argv for command in ('sdist', 'bdist_wheel', 'upload', 'register'))
+
+
+# PyPI classifiers
+_CLASSIFIERS = (
+    # How mature is this project? Common values are
+    #   3 - Alpha
+    #   4 - Beta
+    #   5 - Production/Stable
+    'Development Status :: 5 - Production/Stable',
+
+    # Indicate who your project is intended for
+    'Intended Audience :: Developers',
+    'Topic :: Software Development',
+    'Topic :: Software Development :: Libraries :: Python Modules',
+
+    # Pick your license as you wish (should match "license" in setuptools.setup())
+    'License :: OSI Approved :: MIT License',
 
-    if os.path.isfile(os.path.join(this_directory, 'README.md')):
-        with open(os.path.join(this_directory, 'README.md'), encoding='utf-8') as f:
-            long_description = f.read()
-    else:
-        raise Exception("README.md file not found")
+    # Specify the Python versions you support here. In particular, ensure
+    # that you indicate whether you support Python 2, Python 3 or both.
+    'Programming Language :: Python :: 3',
 
-    return long_description
+    # Operating systems
+    'Operating System :: Unix',
+)
 
 
 if __name__ == '__main__':
 
     setuptools.setup(
-        install_requires=['pexpect==4.8.0'],  # dependency
+        install_requires=['pexpect>=4.8,<5'],  # dependency
         python_requires='>=3',
-        packages=setuptools.find_packages(include=['siswrapper']),
+        packages=['siswrapper'],
 
         name='siswrapper',  # name of the PyPI-package.
-        version=version,    # version number
+        version=get_version(),    # version number
         author="Zenaro Stefano (mario33881)",
         author_email="mariortgasd@hotmail.com",
         url="https://github.com/mario33881/siswrapper",
         keywords='SIS BLIF siswrapper wrapper development',
         license='MIT',
         description='A Python wrapper for SIS',
-        long_description=get_readme(),
+        long_description=get_readme() if needs_readme() else '',
         long_description_content_type='text/markdown',
-        classifiers=[
-            # How mature is this project? Common values are
-            #   3 - Alpha
-            #   4 - Beta
-            #   5 - Production/Stable
-            'Development Status :: 5 - Production/Stable',
-
-            # Indicate who your project is intended for
-            'Intended Audience :: Developers',
-            'Topic :: Software Development',
-            'Topic :: Software Development :: Libraries :: Python Modules',
-
-            # Pick your license as you wish (should match "license" above)
-            'License :: OSI Approved :: MIT License',
-
-            # Specify the Python versions you support here. In particular, ensure
-            # that you indicate whether you support Python 2, Python 3 or both.
-            'Programming Language :: Python :: 3',
-
-            # Operating systems
-            'Operating System :: Unix',
-        ]
+        classifiers=list(_CLASSIFIERS),  # distutils warns about tuples
     )
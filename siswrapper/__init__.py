@@ -1,4 +1,4 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from ._version import __version__
-from .siswrapper import Siswrapper
+from .siswrapper import Siswrapper, AsyncSiswrapper, SiswrapperPool
@@ -13,8 +13,19 @@ Requirements:
 
 __author__ = "Zenaro Stefano"
 
+import asyncio
+import concurrent.futures
+import contextlib
+import copy
+import functools
+import hashlib
+import json
 import os
+import queue
 import re
+import stat
+import sys
+import tempfile
 
 import pexpect
 
@@ -42,11 +53,7 @@ def remove_empty_els(t_v):
     :param list t_v: list of elements
     :return list t_parsed_v: list of elements (no empty strings)
     """
-    t_parsed_v = []
-    for el in t_v:
-        if el.strip() != "":
-            t_parsed_v.append(el.strip())
-
+    t_parsed_v = [el for el in (el.strip() for el in t_v) if el != ""]
     return t_parsed_v
 
 
@@ -60,48 +67,190 @@ def str_to_numbers(t_v):
     out = {"output": [], "errors": []}
 
     try:
-        for el in t_v:
-            out["output"].append(int(el))
+        out["output"] = list(map(int, t_v))
     except ValueError:
-        out["output"] = []
         out["errors"].append("Element(s) is/are not a number")
 
     return out
 
 
-def removeprefix(string, prefix):
+if sys.version_info >= (3, 9):
+    # native (C) implementations
+    removeprefix = str.removeprefix
+    removesuffix = str.removesuffix
+else:
+    def removeprefix(string, prefix):
+        """
+        Returns <string> without the <prefix> prefix.
+
+        Copied from https://www.python.org/dev/peps/pep-0616/#specification
+        to support python versions < 3.9
+
+        :param str string: string from which to remove prefix
+        :param str prefix: prefix to remove from string
+        :return str: string without prefix
+        """
+        if string.startswith(prefix):
+            return string[len(prefix):]
+        else:
+            return string[:]
+
+    def removesuffix(string, suffix):
+        """
+        Returns <string> without the <suffix> suffix.
+
+        Copied from https://www.python.org/dev/peps/pep-0616/#specification
+        to support python versions < 3.9
+
+        :param str string: string from which to remove suffix
+        :param str suffix: suffix to remove from string
+        :return str: string without suffix
+        """
+        # suffix='' should not call self[:-0].
+        if suffix and string.endswith(suffix):
+            return string[:-len(suffix)]
+        else:
+            return string[:]
+
+
+def parse_simulation(t_lines):
+    """
+    Returns the outputs and the next state of the "Network simulation:" part of simulate's output.
+
+    :param list t_lines: stripped lines of the simulation part (header, outputs, next state)
+    :return dict output: outputs and next_state (None if the lines are not a network simulation)
     """
-    Returns <string> without the <prefix> prefix.
+    if t_lines[0] != "Network simulation:":
+        return None
 
-    Copied from https://www.python.org/dev/peps/pep-0616/#specification
-    to support python versions < 3.9
+    return {
+        "outputs": removeprefix(t_lines[1], "Outputs:").replace(" ", ""),
+        "next_state": removeprefix(t_lines[2], "Next state:").strip()
+    }
 
-    :param str string: string from which to remove prefix
-    :param str prefix: prefix to remove from string
-    :return str: string without prefix
+
+def parse_stg_simulation(t_lines):
+    """
+    Returns the outputs and the next states of simulate's output for a network with an STG (FSM).
+
+    :param list t_lines: stripped lines of simulate's output
+    :return dict output: outputs, next_state, stg_outputs and stg_next_state
+                         (None if the lines are not a network and STG simulation)
     """
-    if string.startswith(prefix):
-        return string[len(prefix):]
-    else:
-        return string[:]
+    output = parse_simulation(t_lines[:3])
+    stg_output = parse_simulation(["Network simulation:"] + t_lines[5:7]) if t_lines[4] == "STG simulation:" else None
+
+    if output is None or stg_output is None:
+        return None
+
+    output["stg_outputs"] = stg_output["outputs"]
+    output["stg_next_state"] = stg_output["next_state"]
+    return output
+
+
+# suggested directory for the cache_dir parameter of Siswrapper
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "siswrapper")
+
+# wait_end_command() expect_exact() patterns: prompt, end of a page of paginated output, end of the process, timeout
+# (EOF and TIMEOUT are returned as indexes instead of being raised)
+_END_COMMAND_PATTERNS = ["sis>", "%)", pexpect.EOF, pexpect.TIMEOUT]
 
+# echoed by exec_batch() between the commands to split their output
+_BATCH_SEPARATOR = "__SISWRAPPER_SEPARATOR__"
 
-def removesuffix(string, suffix):
+# commands that print something only when they fail (see Siswrapper.check_output()),
+# the write commands are silent only when they have arguments (they write to a file)
+_SILENT_COMMANDS = ("source script.rugged", "stg_to_network")
+_SILENT_COMMAND_PREFIXES = ("write_blif ", "write_eqn ")
+
+# event loop of the running coroutine (asyncio.get_running_loop() doesn't exist before Python 3.7)
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+# prefixes of the SIS commands that don't modify the network
+# (simulate isn't one of them: it moves the current state of a sequential network)
+_READ_ONLY_COMMANDS = ("print", "write_", "help", "echo", "history", "usage")
+
+
+def _read_command_args(t_match):
     """
-    Returns <string> without the <suffix> suffix.
+    Returns the keyword arguments of read_blif()/read_eqn() for a matched read command.
 
-    Copied from https://www.python.org/dev/peps/pep-0616/#specification
-    to support python versions < 3.9
+    The read command patterns have three alternatives:
+    "-a FILE" (group 1), "FILE -a" (group 2) and "FILE" (group 3).
 
-    :param str string: string from which to remove suffix
-    :param str suffix: suffix to remove from string
-    :return str: string without suffix
+    :param re.Match t_match: match object of the read command
+    :return dict kwargs: t_file (path without quotes) and t_append
     """
-    # suffix='' should not call self[:-0].
-    if suffix and string.endswith(suffix):
-        return string[:-len(suffix)]
-    else:
-        return string[:]
+    if t_match.group(3) is not None:
+        return {"t_file": t_match.group(3).strip('"'), "t_append": False}
+
+    path = t_match.group(1) if t_match.group(1) is not None else t_match.group(2)
+    return {"t_file": path.strip('"'), "t_append": True}
+
+
+# parsed_exec() dispatch table: command name -> (compiled pattern, handler) tuples.
+# Patterns are matched against the whole (stripped) command, the first matching pattern wins,
+# handlers receive the Siswrapper instance and the match object
+_PARSED_EXEC_DISPATCH = {
+    "read_blif": (
+        (re.compile(r"read_blif [\s]*(?:-a [\s]*(\S*)|(\S*) [\s]*-a|(\S*))"),
+         lambda sis, m: sis.read_blif(**_read_command_args(m))),
+    ),
+    "read_eqn": (
+        (re.compile(r"read_eqn [\s]*(?:-a [\s]*(\S*)|(\S*) [\s]*-a|(\S*))"),
+         lambda sis, m: sis.read_eqn(**_read_command_args(m))),
+    ),
+    "write_blif": (
+        (re.compile(r"write_blif [\s]*(\S*)"), lambda sis, m: sis.write_blif(m.group(1).strip('"'))),
+    ),
+    "write_eqn": (
+        (re.compile(r"write_eqn [\s]*(\S*)"), lambda sis, m: sis.write_eqn(m.group(1).strip('"'))),
+    ),
+    "source": (
+        (re.compile(r"source script\.rugged"), lambda sis, m: sis.script_rugged()),
+    ),
+    "print_stats": (
+        (re.compile(r"print_stats"), lambda sis, m: sis.print_stats()),
+    ),
+    "simulate": (
+        (re.compile(r"simulate [\s]*(.*)"), lambda sis, m: sis.simulate(m.group(1))),
+    ),
+    "sim": (
+        (re.compile(r"sim [\s]*(.*)"), lambda sis, m: sis.simulate(m.group(1))),
+    ),
+    "stg_to_network": (
+        (re.compile(r"stg_to_network"), lambda sis, m: sis.stg_to_network()),
+    ),
+}
+
+
+# print_stats output: first line (name, pi, po, nodes, latches) and second line (lits and, for FSMs, states).
+# The groups only match (ASCII) digits: their int() conversion can't fail
+_STATS_RE = re.compile(r"\s*(\S*)\s*pi=\s*(\d+)\s*po=\s*(\d+)\s*nodes=\s*(\d+)\s*latches=\s*(\d+)[ \t]*\r?\n"
+                       r"[ \t]*lits\(sop\)=\s*(\d+)(?:[^\r\n]*#states\(STG\)=\s*(\d+))?[^\r\n]*\s*", re.ASCII)
+
+# characters accepted by simulate()
+_SIMULATE_CHARS = frozenset("01 ")
+
+# simulate() output parsers by number of lines: network with no STGs, network with an STG (FSM)
+_SIMULATE_PARSERS = {3: parse_simulation, 7: parse_stg_simulation}
+
+# libraries accepted by bsisscript_lgate(): library name -> library file
+_LIBRARIES = {"synch": "synch.genlib", "mcnc": "mcnc.genlib"}
+
+# bsis_script parameters: (bsisscript_* method suffix, method arguments)
+_BSIS_SCRIPTS = {
+    "fsm_autoencoding_area": ("fsm", {"autoencoding": True, "opt_area": True}),
+    "fsm_autoencoding_delay": ("fsm", {"autoencoding": True, "opt_area": False}),
+    "fsm_area": ("fsm", {"autoencoding": False, "opt_area": True}),
+    "fsm_delay": ("fsm", {"autoencoding": False, "opt_area": False}),
+    "lgate_area_mcnc": ("lgate", {"opt_area": True, "library": "mcnc"}),
+    "lgate_delay_mcnc": ("lgate", {"opt_area": False, "library": "mcnc"}),
+    "lgate_area_synch": ("lgate", {"opt_area": True, "library": "synch"}),
+    "lgate_delay_synch": ("lgate", {"opt_area": False, "library": "synch"}),
+    "fsmd_area": ("fsmd", {"opt_area": True}),
+    "fsmd_delay": ("fsmd", {"opt_area": False}),
+}
 
 
 class Siswrapper:
@@ -113,18 +262,103 @@ class Siswrapper:
 
     Shared variables:
     * res: dictionary with results of the start operation (success, errors, stdout)
-    * sis: connection to SIS's process
+    * sis: connection to SIS's process (commands sent directly to it bypass network_version's tracking)
     * started: boolean that is set to True if SIS's process is started
     * readsomething: boolean that is set to True if a correct input has been read by SIS
     * read_path: string that contains the path of the read input file
+    * read_path_parts: (read_path, directory, name without .blif) used by partial_results_path()
+    * network_version: counter incremented every time SIS's network might have changed
+    * read_cache: (file key, network_version, results) of the last successful read command
+    * stats_cache: (network_version, results) of the last successful print_stats() call
+    * cache_dir: directory where cached_exec() stores the results of the commands (None = no cache)
+    * fingerprint_cache: (network_version, fingerprint) of the last network_fingerprint() call
+    * caching: boolean that is True while a cached command is executing (nested commands are not cached)
+    * fail_fast: boolean, True means exec_steps() skips the commands after the first failed command
+    * partial_suffix: string added to the name of the partial results files of the bsisscript methods
+    * library: last library read with the read_library command (None if no library has been read)
+    * cwd: working directory of SIS's process (None = the current working directory)
+
+    :param str cache_dir: directory for the cached_exec() cache (None = disabled, see DEFAULT_CACHE_DIR)
+    :param bool fail_fast: True (default) means the bsisscript methods skip the steps after a failed step,
+                           False means they execute all the steps
     """
 
-    def __init__(self):
+    # bsisscript_fsm() steps: (command, output key) tuples,
+    # {encoding} is the state encoding command and {newfile} is partial_results_path()
+    FSM_STEPS_AREA = (
+        ("print_stats", "1_initial_stats"),
+        ("state_minimize stamina", None),
+        ("{encoding}", None),
+        ("print_stats", "2_optimized_states"),
+        ('write_blif "{newfile}.state_min_encoding.blif"', None),
+        ("source script.rugged", None),
+        ("print_stats", "4_rugged_stats"),
+        ('write_blif "{newfile}.optimized.blif"', None),
+        ("read_library synch.genlib", None),
+        ("map -m 0 -W -s", None),
+        ("print_stats", "5_map_stats"),
+        ('write_blif "{newfile}.mapped.blif"', None),
+    )
+
+    FSM_STEPS_DELAY = (
+        ("print_stats", "1_initial_stats"),
+        ("state_minimize stamina", None),
+        ("{encoding}", None),
+        ("print_stats", "2_optimized_states"),
+        ('write_blif "{newfile}.state_min_encoding.blif"', None),
+        ("reduce_depth", None),
+        ("print_stats", "3_reduce_depth_stats"),
+        ("source script.rugged", None),
+        ("print_stats", "4_rugged_stats"),
+        ('write_blif "{newfile}.optimized.blif"', None),
+        ("read_library synch.genlib", None),
+        ("map -n 1 -W -s", None),
+        ("print_stats", "5_map_stats"),
+        ('write_blif "{newfile}.mapped.blif"', None),
+    )
+
+    # bsisscript_lgate() steps: {library} is the library file and {newfile} is partial_results_path()
+    LGATE_STEPS_AREA = (
+        ("print_stats", "1_initial_stats"),
+        ("source script.rugged", None),
+        ("print_stats", "3_rugged_stats"),
+        ('write_blif "{newfile}.optimized.blif"', None),
+        ("read_library {library}", None),
+        ("map -m 0 -W -s", None),
+        ("print_stats", "4_map_stats"),
+        ('write_blif "{newfile}.mapped.blif"', None),
+    )
+
+    LGATE_STEPS_DELAY = (
+        ("print_stats", "1_initial_stats"),
+        ("reduce_depth", None),
+        ("print_stats", "2_reduce_depth_stats"),
+        ("source script.rugged", None),
+        ("print_stats", "3_rugged_stats"),
+        ('write_blif "{newfile}.optimized.blif"', None),
+        ("read_library {library}", None),
+        ("map -n 1 -W -s", None),
+        ("print_stats", "4_map_stats"),
+        ('write_blif "{newfile}.mapped.blif"', None),
+    )
+
+    def __init__(self, cache_dir=None, fail_fast=True):
         self.res = {"success": False, "errors": [], "stdout": None}
         self.sis = None
         self.started = False
         self.readsomething = False
         self.read_path = None
+        self.read_path_parts = None
+        self.network_version = 0
+        self.read_cache = None
+        self.stats_cache = None
+        self.cache_dir = cache_dir
+        self.fingerprint_cache = None
+        self.caching = False
+        self.fail_fast = fail_fast
+        self.partial_suffix = ""
+        self.library = None
+        self.cwd = None
 
         start_res = self.start()
 
@@ -133,8 +367,8 @@ class Siswrapper:
             self.res["stdout"] = start_res["stdout"]
             self.res["success"] = True
         else:
-            for error in start_res["errors"]:
-                self.res["errors"].append("[ERROR][INIT] Error while initializing (start step): " + error)
+            self.res["errors"].extend("[ERROR][INIT] Error while initializing (start step): " + error
+                                      for error in start_res["errors"])
 
     def start(self):
         """
@@ -150,18 +384,25 @@ class Siswrapper:
 
         if not self.started:
             try:
-                self.sis = pexpect.spawn('sis')
+                # bigger reads and no pause after each read: SIS can output a lot of text.
+                # The prompts are searched only at the end of the output (SIS waits for input after them),
+                # the output is decoded while it is read
+                self.sis = pexpect.spawn('sis', maxread=65536, searchwindowsize=256, cwd=self.cwd,
+                                         encoding='utf-8', codec_errors='replace')
+                self.sis.delayafterread = None
 
                 wait_res = self.wait_end_command()
 
                 if wait_res["success"]:
                     self.started = True
+                    self.network_version += 1
+                    self.library = None
 
                     res["success"] = True
                     res["stdout"] = wait_res["stdout"]
                 else:
-                    for error in wait_res["errors"]:
-                        res["errors"].append("[ERROR][START] Error while waiting SIS's startup: " + error)
+                    res["errors"].extend("[ERROR][START] Error while waiting SIS's startup: " + error
+                                         for error in wait_res["errors"])
 
             except pexpect.exceptions.ExceptionPexpect:
                 res["errors"].append("[ERROR][START] Couldn't start SIS: check if "
@@ -190,11 +431,11 @@ class Siswrapper:
                 res["success"] = True
                 res["stdout"] = start_res["stdout"]
             else:
-                for error in start_res["errors"]:
-                    res["errors"].append("[ERROR][RESET] Error while resetting (start step): " + error)
+                res["errors"].extend("[ERROR][RESET] Error while resetting (start step): " + error
+                                     for error in start_res["errors"])
         else:
-            for error in stop_res["errors"]:
-                res["errors"].append("[ERROR][RESET] Error while resetting (stop step): " + error)
+            res["errors"].extend("[ERROR][RESET] Error while resetting (stop step): " + error
+                                 for error in stop_res["errors"])
 
         return res
 
@@ -231,7 +472,7 @@ class Siswrapper:
 
         return res
 
-    def wait_end_command(self, t_command=""):
+    def wait_end_command(self, t_command="", t_timeout=-1):
         """
         Waits the end of a command execution.
 
@@ -241,48 +482,56 @@ class Siswrapper:
         it sends spaces until the "sis>" prompt is shown.
 
         :param str t_command: command that was executed by exec (optional, not needed during the start() method)
+        :param int t_timeout: seconds to wait for each page of output (-1 = pexpect's timeout of the process)
         :return dict res: results of the operation (success, errors, stdout)
         """
         res = {"success": False, "errors": [], "stdout": None}
 
-        try:
-            output = ""
-            paginated = False
-            while True:
-                # try to find the prompt or "--More--(xy%)" (paginated output)
-                match = self.sis.expect(["sis>", r"--(.*)--\((.*)%\)"])
-                page = self.sis.before.decode("utf-8")
-                output += page
-                if match == 0:
-                    # the prompt was found: all the output is in the output variable
-                    break
-                elif match == 1:
+        # pages are already decoded by pexpect (encoding="utf-8")
+        pages = []
+        paginated = False
+        while True:
+            # try to find the prompt or "--More--(xy%)" (paginated output)
+            # (literal search: "--More--(xy%)" is recognized by its "%)" ending)
+            match = self.sis.expect_exact(_END_COMMAND_PATTERNS, timeout=t_timeout)
+            page = self.sis.before
+            if match == 0:
+                # the prompt was found: all the output is in the pages list
+                pages.append(page)
+                break
+            elif match == 1:
+                page, more, rest = page.rpartition("--More--(")
+                if more:
                     # we are reading paginated output, use spaced to scroll through all the text
+                    pages.append(page)
                     paginated = True
                     self.sis.send(" ")
+                else:
+                    # "%)" was part of the command's output
+                    pages.append(rest + "%)")
+            elif match == 2:
+                # entered "quit" or "exit" command
+                res["success"] = True
+                return res
+            else:
+                res["errors"].append("[ERROR][WAIT_END_COMMAND] Timeout while waiting the end of command execution")
+                return res
 
-            # If the command's output was divided in pages 
-            # the first line is probably the command itself: if so then remove it
-            if paginated:
-                v_output = output.split("\r\n")
-                if len(v_output) > 1:
-                    if v_output[0].strip() == t_command:
-                        v_output.pop(0)
-                        output = "\r\n".join(v_output)
-
-            res["success"] = True
-            res["stdout"] = output
+        output = "".join(pages)
 
-        except pexpect.exceptions.TIMEOUT:
-            res["errors"].append("[ERROR][WAIT_END_COMMAND] Timeout while waiting the end of command execution")
+        # If the command's output was divided in pages
+        # the first line is probably the command itself: if so then remove it
+        if paginated:
+            first_line, newline, other_lines = output.partition("\r\n")
+            if newline and first_line.strip() == t_command:
+                output = other_lines
 
-        except pexpect.exceptions.EOF:
-            # entered "quit" or "exit" command
-            res["success"] = True
+        res["success"] = True
+        res["stdout"] = output
 
         return res
 
-    def exec(self, t_command):
+    def exec(self, t_command, t_timeout=-1):
         """
         Executes the <t_command> command using SIS.
 
@@ -294,37 +543,291 @@ class Siswrapper:
         > assumes that the command execution is successfull.
 
         :param str t_command: command to execute using SIS
+        :param int t_timeout: seconds to wait for the end of the command (-1 = pexpect's timeout of the process)
         :return dict res: results of the operation (success, errors, stdout)
         """
         res = {"success": False, "errors": [], "stdout": None}
 
         if self.started:
-            self.sis.sendline(t_command.strip())
+            # SIS executes every command separated by ";"
+            for command in t_command.split(";"):
+                self.track_command(command)
+
+            command = t_command.strip()
+            self.sis.sendline(command)
 
-            wait_res = self.wait_end_command(t_command)
+            wait_res = self.wait_end_command(t_command, t_timeout)
             if wait_res["success"]:
                 res["success"] = True
 
-                # Remove the command from the output
+                # Remove the (echoed) command from the output,
+                # only the leading whitespace has to go before the prefix check
                 res["stdout"] = wait_res["stdout"]
                 if wait_res["stdout"] is not None:
-                    res["stdout"] = removeprefix(wait_res["stdout"].strip(), t_command).strip()
+                    res["stdout"] = removeprefix(wait_res["stdout"].lstrip(), command).strip()
                 else:
                     # if command was quit or exit, change self.started state
-                    if t_command.strip() in ["quit", "exit"]:
+                    if command in ["quit", "exit"]:
                         self.started = False
 
                 if res["stdout"] == "":
                     res["stdout"] = None
             else:
-                for error in wait_res["errors"]:
-                    res["errors"].append("[ERROR][EXEC] Error while waiting for the end of the command: " + error)
+                res["errors"].extend("[ERROR][EXEC] Error while waiting for the end of the command: " + error
+                                     for error in wait_res["errors"])
         else:
             res["errors"].append("[ERROR][EXEC] Can't execute command: SIS's process is not running")
 
         return res
 
-    def parsed_exec(self, t_command):  # noqa: C901
+    def track_command(self, t_command):
+        """
+        Updates the variables that depend on the executed commands (network_version and library).
+
+        :param str t_command: a single SIS command
+        """
+        command = t_command.strip()
+
+        if not command.startswith(_READ_ONLY_COMMANDS):
+            self.network_version += 1
+
+        if command.startswith("read_library "):
+            self.library = command[len("read_library "):].strip()
+
+    def exec_batch(self, t_commands, t_timeout=None):
+        """
+        Executes the <t_commands> commands using SIS with a single round trip.
+
+        The commands are written to a temporary script, executed with SIS' source command,
+        with an "echo" of a separator after each command
+        so that the output can be split into the output of each command.
+
+        If SIS stops executing the script, output only contains the output of the executed commands
+        (the last one is the command that stopped the script).
+
+        The whole script is a single SIS command: by default it can last pexpect's timeout
+        for each command of the batch, like when the commands are executed one at a time.
+
+        :param list t_commands: commands to execute using SIS
+        :param int t_timeout: seconds to wait for the end of the batch (None = pexpect's timeout * number of commands)
+        :return dict res: results of the operation (success, output, errors, stdout)
+                          output is the list with the stdout of each command (None if the command printed nothing)
+        """
+        res = {"success": False, "output": None, "errors": [], "stdout": None}
+
+        if self.started:
+            commands = [command.strip() for command in t_commands]
+            for command in commands:
+                self.track_command(command)
+
+            with tempfile.NamedTemporaryFile("w", suffix=".script", delete=False) as script:
+                for command in commands:
+                    script.write("{}\necho {}\n".format(command, _BATCH_SEPARATOR))
+
+            if t_timeout is None:
+                t_timeout = self.sis.timeout * max(len(commands), 1)
+
+            try:
+                exec_res = self.exec('source "{}"'.format(script.name), t_timeout)
+            finally:
+                os.remove(script.name)
+
+            if exec_res["success"]:
+                res["stdout"] = exec_res["stdout"]
+
+                # every executed command is followed by a separator
+                outputs = ("" if exec_res["stdout"] is None else exec_res["stdout"]).split(_BATCH_SEPARATOR)
+                executed = len(outputs) - 1
+
+                if executed >= len(commands):
+                    res["success"] = True
+                    outputs = outputs[:len(commands)]
+                else:
+                    res["errors"].append("[ERROR][EXEC_BATCH] SIS stopped executing the commands "
+                                         "at '{}'".format(commands[executed]))
+
+                res["output"] = [output.strip() or None for output in outputs]
+            else:
+                res["errors"].extend("[ERROR][EXEC_BATCH] Error during execution: " + error
+                                     for error in exec_res["errors"])
+        else:
+            res["errors"].append("[ERROR][EXEC_BATCH] Can't execute command: SIS's process is not running")
+
+        return res
+
+    def exec_with_stats(self, t_command):
+        """
+        Executes the <t_command> command followed by print_stats with a single exec_batch() call.
+
+        The print_stats results are kept for the next print_stats() call (see stats_cache).
+
+        :param str t_command: command to execute using SIS
+        :return tuple results: results of the command (success, output, errors, stdout)
+                               and results of print_stats (success, output, errors, stdout),
+                               print_stats is not executed if SIS stops at the command
+        """
+        commands = [t_command, "print_stats"]
+        cmd_res, stats_res = self.batch_results(commands, self.exec_batch(commands))
+
+        if stats_res is None:
+            # SIS stopped at the command
+            stats_res = {"success": False, "output": None, "stdout": None,
+                         "errors": ["[ERROR][EXEC_WITH_STATS] print_stats was not executed: "
+                                    "SIS stopped at '{}'".format(t_command.strip())]}
+        elif stats_res["success"]:
+            self.stats_cache = (self.network_version, copy.deepcopy(stats_res))
+
+        return cmd_res, stats_res
+
+    def exec_steps(self, t_commands):
+        """
+        Executes the commands of a script and returns the results of each command.
+
+        Without a cache (cache_dir is None) the commands are executed by exec_batch() calls (see exec_batches()),
+        otherwise every command is executed separately (using cached_exec() when its result can be cached).
+        The output of each command is checked by check_output() or by the command's method.
+
+        When fail_fast is True the commands after the first failed command are skipped
+        (a failed write_blif doesn't stop the script).
+        In a batch the failure is the command that stops SIS' source command:
+        a command whose output shows an error but that SIS considers successful doesn't stop the batch.
+
+        :param list t_commands: commands to execute using SIS
+        :return list results: results of each command (success, output, errors, stdout), None if skipped
+        """
+        if self.cache_dir is None:
+            return self.batches_results(t_commands, self.exec_batches(t_commands))
+
+        results = []
+        failed = False
+        for command in t_commands:
+            command = command.strip()
+
+            if self.fail_fast and failed:
+                cmd_res = None
+            else:
+                if command.startswith(_READ_ONLY_COMMANDS + ("read_library",)):
+                    cmd_res = self.parsed_exec(command)
+                else:
+                    cmd_res = self.cached_exec(command)
+
+                cmd_res.setdefault("output", None)
+                # like in the bsisscript methods, write_blif results don't stop the script
+                if not cmd_res["success"] and not command.startswith("write_blif "):
+                    failed = True
+
+            results.append(cmd_res)
+
+        return results
+
+    def exec_batches(self, t_commands):
+        """
+        Executes the commands of a script using exec_batch() and returns the results of each exec_batch() call.
+
+        SIS stops executing a batch at the first command that fails:
+        unless fail_fast is True the commands after it are executed by another exec_batch() call
+        (a failed write_blif never stops the script).
+
+        :param list t_commands: commands to execute using SIS
+        :return list batches: (index of the first command of the batch, exec_batch() results) of each call
+        """
+        commands = [command.strip() for command in t_commands]
+        batches = []
+        start = 0
+
+        while start < len(commands):
+            batch_res = self.exec_batch(commands[start:])
+            batches.append((start, batch_res))
+
+            if batch_res["success"]:
+                break
+
+            # the last executed command is the one that stopped the batch
+            failed = start + max(len(batch_res["output"] or []) - 1, 0)
+            if self.fail_fast and not commands[failed].startswith("write_blif "):
+                break
+
+            start = failed + 1
+
+        return batches
+
+    def batches_results(self, t_commands, t_batches):
+        """
+        Returns the results of each command executed by exec_batches().
+
+        :param list t_commands: commands executed by exec_batches()
+        :param list t_batches: results of exec_batches()
+        :return list results: results of each command (success, output, errors, stdout), None if skipped
+        """
+        results = [None] * len(t_commands)
+
+        for start, batch_res in t_batches:
+            # each batch executes the commands from <start> to the end of the script
+            results[start:] = self.batch_results(t_commands[start:], batch_res)
+
+        return results
+
+    def check_output(self, t_command, t_stdout):
+        """
+        Returns the results of the executed <t_command> command, checking its output like its method does.
+
+        * print_stats: the output is parsed (see parse_stats())
+        * source script.rugged, stg_to_network, write_blif/write_eqn with arguments:
+          these commands print something only if they fail
+        * any other command is successful
+
+        :param str t_command: executed command
+        :param str t_stdout: output of the command (None if the command printed nothing)
+        :return dict res: results of the command (success, output, errors, stdout)
+        """
+        command = t_command.strip()
+
+        if command == "print_stats":
+            return self.parse_stats(t_stdout)
+
+        res = {"success": True, "output": None, "errors": [], "stdout": t_stdout}
+
+        if command in _SILENT_COMMANDS or command.startswith(_SILENT_COMMAND_PREFIXES):
+            res["success"] = t_stdout is None
+
+        return res
+
+    def batch_results(self, t_commands, t_batch_res):
+        """
+        Returns the results of each command executed by exec_batch().
+
+        The output of each command is checked by check_output().
+        SIS stops executing the batch at the first command that fails:
+        the results of the commands after it are None (skipped, SIS didn't execute them).
+
+        :param list t_commands: commands executed by exec_batch()
+        :param dict t_batch_res: results of exec_batch()
+        :return list results: results of each command (success, output, errors, stdout), None if skipped
+        """
+        results = []
+        outputs = t_batch_res["output"] or []
+
+        for i, command in enumerate(t_commands):
+            if i < len(outputs):
+                cmd_res = self.check_output(command, outputs[i])
+            elif i == 0 and not t_batch_res["success"]:
+                # SIS didn't execute the batch at all
+                cmd_res = {"success": False, "output": None, "errors": [], "stdout": None}
+            else:
+                # SIS stopped before this command
+                cmd_res = None
+
+            results.append(cmd_res)
+
+        if not t_batch_res["success"] and results:
+            # the errors belong to the command that stopped the execution
+            failed_res = results[max(len(outputs) - 1, 0)]
+            failed_res["success"] = False
+            failed_res["errors"].extend(t_batch_res["errors"])
+
+        return results
+
+    def parsed_exec(self, t_command):
         """
         Parses and executes the <t_command> command as best as it thinks it can.
 
@@ -338,111 +841,143 @@ class Siswrapper:
         cmd_res = {"success": False, "errors": [], "stdout": None}
         strip_cmd = t_command.strip()
 
-        # read_blif
-        if re.match(r"^read_blif [\s]*-a [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^read_blif [\s]*-a [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_blif(param, t_append=True)
-
-        elif re.match(r"^read_blif [\s]*(\S*) [\s]*-a$", strip_cmd):
-            param = re.match(r"^read_blif [\s]*(\S*) [\s]*-a$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_blif(param, t_append=True)
-
-        elif re.match(r"^read_blif [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^read_blif [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_blif(param)
-
-        # read_eqn
-        elif re.match(r"^read_eqn [\s]*-a [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^read_eqn [\s]*-a [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_eqn(param, t_append=True)
-
-        elif re.match(r"^read_eqn [\s]*(\S*) [\s]*-a$", strip_cmd):
-            param = re.match(r"^read_eqn [\s]*(\S*) [\s]*-a$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_eqn(param, t_append=True)
-
-        elif re.match(r"^read_eqn [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^read_eqn [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.read_eqn(param)
-
-        # write_blif
-        elif re.match(r"^write_blif [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^write_blif [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.write_blif(param)
-
-        # write_eqn
-        elif re.match(r"^write_eqn [\s]*(\S*)$", strip_cmd):
-            param = re.match(r"^write_eqn [\s]*(\S*)$", strip_cmd).groups()[0]
-            param = param.strip('"')
-            cmd_res = self.write_eqn(param)
-
-        # source script.rugged
-        elif strip_cmd == "source script.rugged":
-            cmd_res = self.script_rugged()
-
-        # print_stats
-        elif strip_cmd == "print_stats":
-            cmd_res = self.print_stats()
-
-        # simulate
-        elif re.match(r"^simulate [\s]*(.*)$", strip_cmd):
-            param = re.match(r"^simulate [\s]*(.*)$", strip_cmd).groups()[0]
-            cmd_res = self.simulate(param)
-
-        elif re.match(r"^sim [\s]*(.*)$", strip_cmd):
-            param = re.match(r"^sim [\s]*(.*)$", strip_cmd).groups()[0]
-            cmd_res = self.simulate(param)
+        for pattern, handler in _PARSED_EXEC_DISPATCH.get(strip_cmd.partition(" ")[0], ()):
+            match = pattern.fullmatch(strip_cmd)
+            if match:
+                return handler(self, match)
 
         # bsis_script command
-        elif strip_cmd.startswith("bsis_script"):
+        if strip_cmd.startswith("bsis_script"):
             param = strip_cmd.replace("bsis_script", "").strip()
-            if param == "fsm_autoencoding_area":
-                cmd_res = self.bsisscript_fsm(autoencoding=True, opt_area=True)
-            elif param == "fsm_autoencoding_delay":
-                cmd_res = self.bsisscript_fsm(autoencoding=True, opt_area=False)
-            elif param == "fsm_area":
-                cmd_res = self.bsisscript_fsm(autoencoding=False, opt_area=True)
-            elif param == "fsm_delay":
-                cmd_res = self.bsisscript_fsm(autoencoding=False, opt_area=False)
-            elif param == "lgate_area_mcnc":
-                cmd_res = self.bsisscript_lgate(opt_area=True, library="mcnc")
-            elif param == "lgate_delay_mcnc":
-                cmd_res = self.bsisscript_lgate(opt_area=False, library="mcnc")
-            elif param == "lgate_area_synch":
-                cmd_res = self.bsisscript_lgate(opt_area=True, library="synch")
-            elif param == "lgate_delay_synch":
-                cmd_res = self.bsisscript_lgate(opt_area=False, library="synch")
-            elif param == "fsmd_area":
-                cmd_res = self.bsisscript_fsmd(opt_area=True)
-            elif param == "fsmd_delay":
-                cmd_res = self.bsisscript_fsmd(opt_area=False)
+            if param in _BSIS_SCRIPTS:
+                script, kwargs = _BSIS_SCRIPTS[param]
+                cmd_res = getattr(self, "bsisscript_" + script)(**kwargs)
             else:
                 cmd_res = {"success": False,
                            "errors": ["[ERROR][BSIS_SCRIPT] Unexpected bsis_script parameter"],
                            "stdout": None}
 
-        # stg_to_network
-        elif strip_cmd == "stg_to_network":
-            cmd_res = self.stg_to_network()
-
         # command not found... execute it
         else:
             cmd_res = self.exec(strip_cmd)
 
         return cmd_res
 
+    def network_fingerprint(self):
+        """
+        Returns a hash of the current network.
+
+        The network is written to a BLIF file inside the cache directory and then hashed,
+        the hash is reused until the network changes (see network_version).
+
+        :return str fingerprint: hex digest of the network's BLIF description (None if it couldn't be written)
+        """
+        if self.fingerprint_cache is not None and self.fingerprint_cache[0] == self.network_version:
+            return self.fingerprint_cache[1]
+
+        network_path = os.path.join(self.cache_dir, "network.{}.{}.blif".format(os.getpid(), id(self)))
+
+        exec_res = self.exec('write_blif "{}"'.format(network_path))
+        if not exec_res["success"] or exec_res["stdout"] is not None or not os.path.isfile(network_path):
+            return None
+
+        with open(network_path, "rb") as f:
+            fingerprint = hashlib.sha256(f.read()).hexdigest()
+
+        os.remove(network_path)
+        self.fingerprint_cache = (self.network_version, fingerprint)
+        return fingerprint
+
+    def memoized(self, t_command, t_function):
+        """
+        Executes <t_function>(<t_command>) caching its results on disk.
+
+        The results are cached by function, command, library and network fingerprint.
+        If the command can modify the network the resulting network is cached too:
+        when the same command is executed on the same network the cached network is read
+        instead of executing the command again.
+        Without a cache directory (cache_dir is None), or while another cached command is executing,
+        the function is simply called.
+
+        :param str t_command: command to execute using SIS
+        :param function t_function: method that executes the command (for example self.exec)
+        :return dict cmd_res: results of the operation (success, errors, stdout)
+        """
+        if self.cache_dir is None or self.caching or not self.started or not self.readsomething:
+            return t_function(t_command)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        fingerprint = self.network_fingerprint()
+        if fingerprint is None:
+            return t_function(t_command)
+
+        strip_cmd = t_command.strip()
+        read_only = strip_cmd.startswith(_READ_ONLY_COMMANDS)
+        key_data = "{}\n{}\n{}\n{}".format(t_function.__name__, strip_cmd, self.library, fingerprint)
+        key = hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+        entry_path = os.path.join(self.cache_dir, key + ".json")
+        blif_path = os.path.join(self.cache_dir, key + ".blif")
+
+        if os.path.isfile(entry_path) and (read_only or os.path.isfile(blif_path)):
+            with open(entry_path, encoding="utf-8") as f:
+                cmd_res = json.load(f)
+
+            if not read_only:
+                exec_res = self.exec('read_blif "{}"'.format(blif_path))
+                if not exec_res["success"]:
+                    cmd_res = {"success": False, "errors": [], "stdout": None}
+                    cmd_res["errors"].extend("[ERROR][MEMOIZED] Error while reading the cached network: " + error
+                                             for error in exec_res["errors"])
+
+            return cmd_res
+
+        self.caching = True
+        try:
+            cmd_res = t_function(t_command)
+        finally:
+            self.caching = False
+
+        if cmd_res["success"]:
+            if not read_only:
+                exec_res = self.exec('write_blif "{}"'.format(blif_path))
+                if not exec_res["success"] or exec_res["stdout"] is not None:
+                    return cmd_res
+
+            # write the entry only when it is complete, other processes might be reading the cache
+            tmp_entry_path = "{}.{}.tmp".format(entry_path, os.getpid())
+            with open(tmp_entry_path, "w", encoding="utf-8") as f:
+                json.dump(cmd_res, f)
+            os.replace(tmp_entry_path, entry_path)
+
+        return cmd_res
+
+    def cached_exec(self, t_command):
+        """
+        Executes the <t_command> command using parsed_exec(), caching its results on disk (see memoized()).
+
+        Without a cache directory (cache_dir is None) this method is the same as parsed_exec().
+
+        Use it only for commands whose result depends only on the network (for example
+        "source script.rugged", NOT read_library which changes the SIS's state but not the network).
+
+        :param str t_command: command to execute using SIS
+        :return dict cmd_res: results of the operation (success, errors, stdout)
+        """
+        return self.memoized(t_command, self.parsed_exec)
+
     def interact(self):
         """
         Gives SIS control to the user.
+
+        The commands typed by the user are not tracked:
+        network_version is incremented when the user gives the control back,
+        so the cached results (read_cache, stats_cache, fingerprint_cache) are not reused.
+        (commands sent directly to the sis variable are not tracked either)
         """
         if self.started:
             self.sis.interact()
+            self.network_version += 1
         else:
             raise Exception("SIS's process is not running")
 
@@ -465,120 +1000,104 @@ class Siswrapper:
     #
     # ====================================================================================================
 
-    def read_blif(self, t_file, t_changedir=True, t_append=False):
+    def read_file(self, t_command, t_file, t_changedir=True, t_append=False):  # noqa: C901
         """
-        Executes SIS' read_blif command which reads .blif files.
+        Executes the <t_command> SIS read command (read_blif or read_eqn) which reads the <t_file> file.
 
-        :param str t_file: path to the .blif file
-        :param bool t_changedir: True means change working directory to the blif directory
+        :param str t_command: SIS read command (read_blif or read_eqn)
+        :param str t_file: path to the file
+        :param bool t_changedir: True means change SIS's working directory to the file directory
         :param bool t_append: True means append file to the current network
         :return dict res: results of the operation (success, errors, warnings, stdout)
         """
         res = {"success": False, "errors": [], "warnings": [], "stdout": None}
+        error_prefix = "[ERROR][{}]".format(t_command.upper())
 
         if self.started:
-            blif_fullpath = os.path.realpath(t_file)
-            blif_path = os.path.dirname(blif_fullpath)
+            file_fullpath = os.path.realpath(t_file)
+            file_path = os.path.dirname(file_fullpath)
 
-            if t_changedir:
-                os.chdir(blif_path)
-                self.reset()
-
-            if os.path.isfile(blif_fullpath):
+            # a single stat() call both checks the file and gives the read cache key
+            try:
+                file_stat = os.stat(file_fullpath)
+            except OSError:
+                file_stat = None
+            is_file = file_stat is not None and stat.S_ISREG(file_stat.st_mode)
+
+            # reading again the same unchanged file into the same (unchanged) network does nothing
+            cache_key = None
+            if not t_append and is_file:
+                cache_key = (t_command, file_fullpath, file_stat.st_mtime_ns, file_stat.st_size)
+                if self.read_cache is not None and self.read_cache[:2] == (cache_key, self.network_version):
+                    return copy.deepcopy(self.read_cache[2])
+
+            if is_file and t_changedir and file_path != self.cwd:
+                # SIS resolves the paths inside the file (.search) from its working directory:
+                # restart SIS inside the file's folder, only if it isn't already there
+                previous_cwd = self.cwd
+                self.cwd = file_path
+                reset_res = self.reset()
+
+                if not reset_res["success"]:
+                    self.cwd = previous_cwd
+                    res["errors"].extend(error_prefix + " Can't restart SIS inside the file's folder: " + error
+                                         for error in reset_res["errors"])
+                    return res
+
+            if is_file:
                 if t_append:
-                    exec_res = self.exec('read_blif -a "' + blif_fullpath + '"')
+                    exec_res = self.exec('{} -a "{}"'.format(t_command, file_fullpath))
                 else:
-                    exec_res = self.exec('read_blif "' + blif_fullpath + '"')
+                    exec_res = self.exec('{} "{}"'.format(t_command, file_fullpath))
 
                 if exec_res["success"]:
                     res["stdout"] = exec_res["stdout"]
 
                     if exec_res["stdout"]:
-                        found_errors = False
-
-                        for message in res["stdout"].split("\r\n"):
-                            if message.strip().startswith("Warning: "):
-                                warning = self.manage_errors(message.strip())
-                                res["warnings"].append(warning)
-                            else:
-                                error = self.manage_errors(message.strip())
-                                res["errors"].append(error)
-                                found_errors = True
-
-                        if not found_errors:
-                            res["success"] = True
-                            self.readsomething = True
-                            self.read_path = blif_fullpath
-                    else:
+                        # every (stripped) non empty line that is not a warning is an error
+                        for line in res["stdout"].splitlines():
+                            message = line.strip()
+
+                            if message.startswith("Warning: "):
+                                res["warnings"].append(self.manage_errors(message))
+                            elif message:
+                                res["errors"].append(self.manage_errors(message))
+
+                    if not res["errors"]:
                         res["success"] = True
                         self.readsomething = True
-                        self.read_path = blif_fullpath
+                        self.read_path = file_fullpath
+                        self.read_cache = (cache_key, self.network_version, copy.deepcopy(res))
                 else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][READ_BLIF] Error during execution: " + error)
+                    res["errors"].extend(error_prefix + " Error during execution: " + error
+                                         for error in exec_res["errors"])
             else:
-                res["errors"].append("[ERROR][READ_BLIF] '{}' file doesn't exist".format(blif_fullpath))
+                res["errors"].append(error_prefix + " '{}' file doesn't exist".format(file_fullpath))
         else:
-            res["errors"].append("[ERROR][READ_BLIF] Can't execute command: SIS's process is not running")
+            res["errors"].append(error_prefix + " Can't execute command: SIS's process is not running")
 
         return res
 
+    def read_blif(self, t_file, t_changedir=True, t_append=False):
+        """
+        Executes SIS' read_blif command which reads .blif files.
+
+        :param str t_file: path to the .blif file
+        :param bool t_changedir: True means change SIS's working directory to the blif directory
+        :param bool t_append: True means append file to the current network
+        :return dict res: results of the operation (success, errors, warnings, stdout)
+        """
+        return self.read_file("read_blif", t_file, t_changedir, t_append)
+
     def read_eqn(self, t_file, t_changedir=True, t_append=False):
         """
         Executes SIS' read_eqn command which reads .eqn (equation) files.
         :param str t_file: path to the .eqn file
-        :param bool t_changedir: True means change working directory to the eqn directory
+        :param bool t_changedir: True means change SIS's working directory to the eqn directory
         :param bool t_append: True means append file to the current network
         :return dict res: results of the operation (success, errors, warnings, stdout)
         """
-        res = {"success": False, "errors": [], "stdout": None}
-
-        if self.started:
-            eqn_fullpath = os.path.realpath(t_file)
-            eqn_path = os.path.dirname(eqn_fullpath)
-
-            if t_changedir:
-                os.chdir(eqn_path)
-                self.reset()
-
-            if os.path.isfile(eqn_fullpath):
-                if t_append:
-                    exec_res = self.exec('read_eqn -a "' + eqn_fullpath + '"')
-                else:
-                    exec_res = self.exec('read_eqn "' + eqn_fullpath + '"')
-
-                if exec_res["success"]:
-                    res["stdout"] = exec_res["stdout"]
-
-                    if exec_res["stdout"]:
-                        found_errors = False
-
-                        for message in res["stdout"].split("\r\n"):
-                            if message.strip().startswith("Warning: "):
-                                warning = self.manage_errors(message.strip())
-                                res["warnings"].append(warning)
-                            else:
-                                error = self.manage_errors(message.strip())
-                                res["errors"].append(error)
-                                found_errors = True
-
-                        if not found_errors:
-                            res["success"] = True
-                            self.readsomething = True
-                            self.read_path = eqn_fullpath
-                    else:
-                        res["success"] = True
-                        self.readsomething = True
-                        self.read_path = eqn_fullpath
-                else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][READ_EQN] Error during execution: " + error)
-            else:
-                res["errors"].append("[ERROR][READ_EQN] '{}' file doesn't exist".format(eqn_fullpath))
-        else:
-            res["errors"].append("[ERROR][READ_EQN] Can't execute command: SIS's process is not running")
-
-        return res
+        return self.read_file("read_eqn", t_file, t_changedir, t_append)
 
     # ====================================================================================================
     #
@@ -586,49 +1105,52 @@ class Siswrapper:
     #
     # ====================================================================================================
 
-    def write_blif(self, t_file="", t_params=""):
+    def write_file(self, t_command, t_file="", t_params=""):
         """
-        Executes SIS' write_blif command which outputs the circuit to a .blif file.
+        Executes the <t_command> SIS write command (write_blif or write_eqn) which outputs the circuit.
 
-        :param str t_file: file path of the output
-        :param str t_params: extra parameters
+        :param str t_command: SIS write command (write_blif or write_eqn)
+        :param str t_file: file path of the output (empty = print current network)
+        :param str t_params: extra parameters (empty = no extra parameters)
         :return dict res: results of the operation (success, errors, stdout)
         """
         res = {"success": False, "errors": [], "stdout": None}
+        error_prefix = "[ERROR][{}]".format(t_command.upper())
 
         if self.started:
             if self.readsomething:
-
-                if t_file == "" and t_params == "":
-                    exec_res = self.exec('write_blif')
-                elif t_params == "" and t_file != "":
-                    exec_res = self.exec('write_blif ' + t_file)
-                elif t_params != "" and t_file == "":
-                    exec_res = self.exec('write_blif ' + t_params)
-                else:
-                    exec_res = self.exec('write_blif ' + t_params + ' ' + t_file)
+                command = " ".join(arg for arg in (t_command, t_params, t_file) if arg != "")
+                exec_res = self.exec(command)
 
                 res["stdout"] = exec_res["stdout"]
 
                 if exec_res["success"]:
-                    if t_file == "" and t_params == "":
+                    # writing to a file prints nothing
+                    if self.check_output(command, exec_res["stdout"])["success"]:
                         res["success"] = True
                     else:
-                        if res["stdout"] is None:
-                            res["success"] = True
-                        else:
-                            res["errors"].append("[ERROR][WRITE_BLIF] Something went wrong during write_blif")
+                        res["errors"].append("{} Something went wrong during {}".format(error_prefix, t_command))
                 else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][WRITE_BLIF] Error during execution: " + error)
+                    res["errors"].extend(error_prefix + " Error during execution: " + error
+                                         for error in exec_res["errors"])
             else:
-                res["errors"].append("[ERROR][WRITE_BLIF] Nothing to write/show "
+                res["errors"].append(error_prefix + " Nothing to write/show "
                                      "(missing an input, use read_blif or another read command)")
         else:
-            res["errors"].append("[ERROR][WRITE_BLIF] Can't execute command: SIS's process is not running")
+            res["errors"].append(error_prefix + " Can't execute command: SIS's process is not running")
 
         return res
 
+    def write_blif(self, t_file="", t_params=""):
+        """
+        Executes SIS' write_blif command which outputs the circuit to a .blif file.
+
+        :param str t_file: file path of the output
+        :param str t_params: extra parameters
+        :return dict res: results of the operation (success, errors, stdout)
+        """
+        return self.write_file("write_blif", t_file, t_params)
+
     def write_eqn(self, t_file="", t_params=""):
         """
         Executes SIS' write_eqn command which outputs the circuit to a .eqn (equation) file.
@@ -637,40 +1159,7 @@ class Siswrapper:
         :param str t_params: extra parameters (empty = no extra parameters)
         :return dict res: results of the operation (success, errors, stdout)
         """
-        res = {"success": False, "errors": [], "stdout": None}
-
-        if self.started:
-            if self.readsomething:
-
-                if t_file == "" and t_params == "":
-                    exec_res = self.exec('write_eqn')
-                elif t_params == "" and t_file != "":
-                    exec_res = self.exec('write_eqn ' + t_file)
-                elif t_params != "" and t_file == "":
-                    exec_res = self.exec('write_eqn ' + t_params)
-                else:
-                    exec_res = self.exec('write_eqn ' + t_params + ' ' + t_file)
-
-                res["stdout"] = exec_res["stdout"]
-
-                if exec_res["success"]:
-                    if t_file == "" and t_params == "":
-                        res["success"] = True
-                    else:
-                        if exec_res["stdout"] is None:
-                            res["success"] = True
-                        else:
-                            res["errors"].append("[ERROR][WRITE_EQN] Something went wrong during write_eqn")
-                else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][WRITE_EQN] Error during execution: " + error)
-            else:
-                res["errors"].append("[ERROR][WRITE_EQN] Nothing to write/show "
-                                     "(missing an input, use read_blif or another read command)")
-        else:
-            res["errors"].append("[ERROR][WRITE_EQN] Can't execute command: SIS's process is not running")
-
-        return res
+        return self.write_file("write_eqn", t_file, t_params)
 
     # ====================================================================================================
     #
@@ -688,15 +1177,13 @@ class Siswrapper:
 
         if self.started:
             if self.readsomething:
-                exec_res = self.exec("source script.rugged")
+                exec_res = self.memoized("source script.rugged", self.exec)
                 if exec_res["success"]:
                     res["stdout"] = exec_res["stdout"]
-
-                    if res["stdout"] is None:
-                        res["success"] = True
+                    res["success"] = self.check_output("source script.rugged", res["stdout"])["success"]
                 else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][SCRIPT_RUGGED] Error during execution: " + error)
+                    res["errors"].extend("[ERROR][SCRIPT_RUGGED] Error during execution: " + error
+                                         for error in exec_res["errors"])
             else:
                 res["errors"].append("[ERROR][SCRIPT_RUGGED] Nothing to optimize "
                                      "(missing an input, use read_blif or another read command)")
@@ -705,220 +1192,163 @@ class Siswrapper:
 
         return res
 
-    def bsisscript_fsm(self, autoencoding, opt_area):  # noqa: C901
+    def merge_step(self, res, t_stdout_parts, t_command, t_cmd_res, t_output_key=None):
         """
-        Executes many commands to optimize and map an FSM using SIS.
+        Collects the results of a script step inside <res>.
 
-        * state_minimize stamina
-        * state_assign jedi / stg_to_network (autoencoding True/False)
-        * reduce_depth if opt_area is False
-        * source script.rugged
-        * read_library synch.genlib
-        * map -m 0 -W -s / map -n 1 -W -s (opt_area True/False)
-
-        :param bool autoencoding: True = automatically encodes states
-        :param bool opt_area: True = optimize area, False = optimize delay
-        :return dict res: results of the operation (success, output, errors, stdout)
+        :param dict res: results of the script (success, output, errors, stdout)
+        :param list t_stdout_parts: parts of the script's stdout (the step's stdout is appended)
+        :param str t_command: command of the step
+        :param dict t_cmd_res: results of the step (success, output, errors, stdout), None if skipped
+        :param str t_output_key: key of res["output"] for the parsed output of the step (None = not saved)
         """
-        res = {"success": True, "output": {}, "errors": [], "stdout": ""}
+        if t_cmd_res is None:
+            t_stdout_parts.append("sis> {} (skipped)\n".format(t_command))
+            return
 
-        newfile_path = os.path.dirname(self.read_path)
+        t_stdout_parts.append("sis> {}\n".format(t_command))
 
-        newfile_name = os.path.basename(self.read_path)
-        newfile_name = removesuffix(newfile_name, ".blif")
-        newfile_name += ".{}.blif"
+        res["errors"].extend(t_cmd_res["errors"])
 
-        newfile_fullpath = os.path.join(newfile_path, newfile_name)
+        if t_output_key is not None and t_cmd_res["output"]:
+            res["output"][t_output_key] = t_cmd_res["output"]
 
-        if self.started:
-            if self.readsomething:
-
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["output"]:
-                    res["output"]["1_initial_stats"] = cmd_res["output"]
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # state_minimize stamina
-                cmd_res = self.parsed_exec("state_minimize stamina")
-                res["stdout"] += "sis> state_minimize stamina\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # state_assign / stg_to_network
-                if autoencoding:
-                    cmd_res = self.parsed_exec("state_assign jedi")
-                    res["stdout"] += "sis> state_assign jedi\n"
-                else:
-                    cmd_res = self.parsed_exec("stg_to_network")
-                    res["stdout"] += "sis> stg_to_network\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
+        if t_cmd_res["stdout"]:
+            t_stdout_parts.append("\n" + t_cmd_res["stdout"] + "\n")
 
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["output"]:
-                    res["output"]["2_optimized_states"] = cmd_res["output"]
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                self.write_blif(newfile_fullpath.format("state_min_encoding"))
-
-                # reduce_depth (if opt_area is False)
-                if not opt_area:
-                    cmd_res = self.parsed_exec("reduce_depth")
-
-                    res["stdout"] += "sis> reduce_depth\n"
-
-                    for error in cmd_res["errors"]:
-                        res["errors"].append(error)
-
-                    if cmd_res["stdout"]:
-                        res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                    if not cmd_res["success"]:
-                        res["success"] = False
-
-                    # print_stats
-                    cmd_res = self.print_stats()
-                    res["stdout"] += "sis> print_stats\n"
-
-                    for error in cmd_res["errors"]:
-                        res["errors"].append(error)
-
-                    if cmd_res["output"]:
-                        res["output"]["3_reduce_depth_stats"] = cmd_res["output"]
+        if not t_cmd_res["success"]:
+            res["success"] = False
 
-                    if cmd_res["stdout"]:
-                        res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+    def run_script_steps(self, res, t_steps, t_results=None):
+        """
+        Executes the steps of a bsisscript method and collects their results inside <res>.
 
-                    if not cmd_res["success"]:
-                        res["success"] = False
+        Each step is a (command, output key) tuple:
+        the parsed output of the command (print_stats) is saved inside res["output"][output key].
+        write_blif steps save partial results to files: they are not part of the stdout
+        and they don't change the success of the script.
 
-                # script.rugged
-                cmd_res = self.parsed_exec("source script.rugged")
-                res["stdout"] += "sis> source script.rugged\n"
+        :param dict res: results of the script (success, output, errors, stdout)
+        :param list t_steps: list of (command, output key) tuples, output key can be None
+        :param list t_results: results of the already executed steps (None = execute them using exec_steps())
+        """
+        if t_results is None:
+            t_results = self.exec_steps([command for command, _ in t_steps])
 
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
+        stdout_parts = [res["stdout"]]
 
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+        for (command, output_key), cmd_res in zip(t_steps, t_results):
+            if not command.startswith("write_blif "):
+                self.merge_step(res, stdout_parts, command, cmd_res, output_key)
 
-                if not cmd_res["success"]:
-                    res["success"] = False
+        res["stdout"] = "".join(stdout_parts)
 
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
+    def partial_results_path(self):
+        """
+        Returns the path, without extension, of the partial results saved by the bsisscript methods.
 
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
+        The partial results are saved next to the read file.
 
-                if cmd_res["output"]:
-                    res["output"]["4_rugged_stats"] = cmd_res["output"]
+        :return str path: path of the read file without the .blif extension (followed by partial_suffix)
+        """
+        if self.read_path_parts is None or self.read_path_parts[0] != self.read_path:
+            # split the path only once for every read file
+            self.read_path_parts = (self.read_path, os.path.dirname(self.read_path),
+                                    removesuffix(os.path.basename(self.read_path), ".blif"))
 
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+        return os.path.join(self.read_path_parts[1], self.read_path_parts[2] + self.partial_suffix)
 
-                if not cmd_res["success"]:
-                    res["success"] = False
+    def fsm_steps(self, autoencoding, opt_area):
+        """
+        Returns the steps executed by bsisscript_fsm() (see run_script_steps()).
 
-                self.write_blif(newfile_fullpath.format("optimized"))
+        :param bool autoencoding: True = automatically encodes states
+        :param bool opt_area: True = optimize area, False = optimize delay
+        :return list steps: list of (command, output key) tuples
+        """
+        steps = self.FSM_STEPS_AREA if opt_area else self.FSM_STEPS_DELAY
+        encoding = "state_assign jedi" if autoencoding else "stg_to_network"
+        newfile = self.partial_results_path()
 
-                # read_library
-                cmd_res = self.parsed_exec("read_library synch.genlib")
-                res["stdout"] += "sis> read_library synch.genlib\n"
+        return [(command.format(encoding=encoding, newfile=newfile), key) for command, key in steps]
 
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
+    def bsisscript_fsm(self, autoencoding, opt_area):
+        """
+        Executes many commands to optimize and map an FSM using SIS.
 
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+        * state_minimize stamina
+        * state_assign jedi / stg_to_network (autoencoding True/False)
+        * reduce_depth if opt_area is False
+        * source script.rugged
+        * read_library synch.genlib
+        * map -m 0 -W -s / map -n 1 -W -s (opt_area True/False)
 
-                if not cmd_res["success"]:
-                    res["success"] = False
+        :param bool autoencoding: True = automatically encodes states
+        :param bool opt_area: True = optimize area, False = optimize delay
+        :return dict res: results of the operation (success, output, errors, stdout)
+        """
+        res = {"success": True, "output": {}, "errors": [], "stdout": ""}
 
-                # map
-                if opt_area:
-                    cmd_res = self.parsed_exec("map -m 0 -W -s")
-                    res["stdout"] += "sis> map -m 0 -W -s\n"
-                else:
-                    cmd_res = self.parsed_exec("map -n 1 -W -s")
-                    res["stdout"] += "sis> map -n 1 -W -s\n"
+        if self.started:
+            if self.readsomething:
+                # without a cache the steps are executed by source commands (see exec_batches())
+                self.run_script_steps(res, self.fsm_steps(autoencoding, opt_area))
+            else:
+                res["success"] = False
+                res["errors"].append("[ERROR][BSISSCRIPT_FSM] Nothing to optimize and map "
+                                     "(missing an input, use read_blif or another read command)")
+        else:
+            # SIS is not running
+            res["success"] = False
+            res["errors"].append("[ERROR][BSISSCRIPT_FSM] Can't execute command: SIS's process is not running")
 
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
+        return res
 
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+    def lgate_steps(self, opt_area, library):
+        """
+        Returns the steps executed by bsisscript_lgate() (see run_script_steps()).
 
-                if not cmd_res["success"]:
-                    res["success"] = False
+        :param bool opt_area: True = optimize area, False = optimize delay
+        :param str library: mcnc = mcnc.genlib, synch = synch.genlib (other libraries are used as they are)
+        :return list steps: list of (command, output key) tuples
+        """
+        steps = self.LGATE_STEPS_AREA if opt_area else self.LGATE_STEPS_DELAY
+        library_file = _LIBRARIES.get(library, library)
+        newfile = self.partial_results_path()
 
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
+        return [(command.format(library=library_file, newfile=newfile), key) for command, key in steps]
 
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
+    @classmethod
+    def run_dual(cls, t_file, autoencoding=True, **kwargs):
+        """
+        Optimizes and maps the <t_file> FSM both for area and for delay, in parallel using two SIS processes.
 
-                if cmd_res["output"]:
-                    res["output"]["5_map_stats"] = cmd_res["output"]
+        The partial results of the runs are saved next to the file
+        with the .area/.delay suffixes (for example automa.area.optimized.blif).
 
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
+        :param str t_file: path to the .blif file
+        :param bool autoencoding: True = automatically encodes states
+        :param kwargs: keyword arguments passed to the Siswrapper constructor (for example cache_dir)
+        :return dict res: bsisscript_fsm() results of the two runs (area and delay)
+        """
+        def job(worker, opt_area):
+            worker.partial_suffix = ".area" if opt_area else ".delay"
 
-                if not cmd_res["success"]:
-                    res["success"] = False
+            read_res = worker.read_blif(t_file)
+            if not read_res["success"]:
+                return {"success": False, "output": {}, "errors": read_res["errors"], "stdout": read_res["stdout"]}
 
-                self.write_blif(newfile_fullpath.format("mapped"))
+            return worker.bsisscript_fsm(autoencoding, opt_area)
 
-            else:
-                res["success"] = False
-                res["errors"].append("[ERROR][BSISSCRIPT_FSM] Nothing to optimize and map "
-                                     "(missing an input, use read_blif or another read command)")
-        else:
-            # SIS is not running
-            res["success"] = False
-            res["errors"].append("[ERROR][BSISSCRIPT_FSM] Can't execute command: SIS's process is not running")
+        pool = SiswrapperPool(size=2, **kwargs)
+        try:
+            area_res, delay_res = pool.map(job, (True, False))
+        finally:
+            pool.stop()
 
-        return res
+        return {"area": area_res, "delay": delay_res}
 
-    def bsisscript_lgate(self, opt_area, library):  # noqa: C901
+    def bsisscript_lgate(self, opt_area, library):
         """
         Executes many commands to optimize and map a combinational circuit using SIS.
 
@@ -933,150 +1363,28 @@ class Siswrapper:
         """
         res = {"success": True, "output": {}, "errors": [], "stdout": ""}
 
-        newfile_path = os.path.dirname(self.read_path)
-
-        newfile_name = os.path.basename(self.read_path)
-        newfile_name = removesuffix(newfile_name, ".blif")
-        newfile_name += ".{}.blif"
-
-        newfile_fullpath = os.path.join(newfile_path, newfile_name)
-
         if self.started:
             if self.readsomething:
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["output"]:
-                    res["output"]["1_initial_stats"] = cmd_res["output"]
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # reduce_depth (if opt_area is False)
-                if not opt_area:
-                    cmd_res = self.parsed_exec("reduce_depth")
-
-                    res["stdout"] += "sis> reduce_depth\n"
-
-                    for error in cmd_res["errors"]:
-                        res["errors"].append(error)
-
-                    if cmd_res["stdout"]:
-                        res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                    if not cmd_res["success"]:
-                        res["success"] = False
-
-                    # print_stats
-                    cmd_res = self.print_stats()
-                    res["stdout"] += "sis> print_stats\n"
-
-                    for error in cmd_res["errors"]:
-                        res["errors"].append(error)
+                steps = self.lgate_steps(opt_area, library)
 
-                    if cmd_res["output"]:
-                        res["output"]["2_reduce_depth_stats"] = cmd_res["output"]
-
-                    if cmd_res["stdout"]:
-                        res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                    if not cmd_res["success"]:
-                        res["success"] = False
-
-                # script.rugged
-                cmd_res = self.parsed_exec("source script.rugged")
-                res["stdout"] += "sis> source script.rugged\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["output"]:
-                    res["output"]["3_rugged_stats"] = cmd_res["output"]
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                self.write_blif(newfile_fullpath.format("optimized"))
-
-                # read_library
-                if library == "synch":
-                    cmd_res = self.parsed_exec("read_library synch.genlib")
-                    res["stdout"] += "sis> read_library synch.genlib\n"
-                elif library == "mcnc":
-                    cmd_res = self.parsed_exec("read_library mcnc.genlib")
-                    res["stdout"] += "sis> read_library mcnc.genlib\n"
+                if library in _LIBRARIES:
+                    # without a cache the steps are executed by source commands (see exec_batches())
+                    self.run_script_steps(res, steps)
                 else:
-                    cmd_res = {"success": False,
-                               "errors": ["[ERROR][BSISSCRIPT_LGATE] library '{}' doesn't exist".format(library)],
-                               "stdout": None}
-                    res["stdout"] += "sis> read_library {}\n".format(library)
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # map
-                if opt_area:
-                    cmd_res = self.parsed_exec("map -m 0 -W -s")
-                    res["stdout"] += "sis> map -m 0 -W -s\n"
-                else:
-                    cmd_res = self.parsed_exec("map -n 1 -W -s")
-                    res["stdout"] += "sis> map -n 1 -W -s\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
-
-                # print_stats
-                cmd_res = self.print_stats()
-                res["stdout"] += "sis> print_stats\n"
-
-                for error in cmd_res["errors"]:
-                    res["errors"].append(error)
-
-                if cmd_res["output"]:
-                    res["output"]["4_map_stats"] = cmd_res["output"]
-
-                if cmd_res["stdout"]:
-                    res["stdout"] += "\n" + cmd_res["stdout"] + "\n"
-
-                if not cmd_res["success"]:
-                    res["success"] = False
+                    # the library can't be read: the script goes on without it
+                    library_step = steps.index(("read_library {}".format(library), None))
+                    library_res = {"success": False,
+                                   "output": None,
+                                   "errors": ["[ERROR][BSISSCRIPT_LGATE] library '{}' doesn't exist".format(library)],
+                                   "stdout": None}
+
+                    results = self.exec_steps([command for command, _ in steps[:library_step]]) + [library_res]
+                    if self.fail_fast:
+                        results += [None] * (len(steps) - library_step - 1)
+                    else:
+                        results += self.exec_steps([command for command, _ in steps[library_step + 1:]])
 
-                self.write_blif(newfile_fullpath.format("mapped"))
+                    self.run_script_steps(res, steps, results)
             else:
                 res["success"] = False
                 res["errors"].append("[ERROR][BSISSCRIPT_LGATE] Nothing to optimize and map "
@@ -1109,6 +1417,39 @@ class Siswrapper:
     #
     # ====================================================================================================
 
+    def parse_stats(self, t_stdout):
+        """
+        Parses the output of SIS' print_stats command.
+
+        :param str t_stdout: output of the print_stats command
+        :return dict res: results of the parsing (success, output, errors, stdout)
+        """
+        res = {"success": False, "output": None, "errors": [], "stdout": t_stdout}
+
+        mstats = None if t_stdout is None else _STATS_RE.fullmatch(t_stdout)
+
+        if mstats:
+            name, pi, po, nodes, latches, lits, states = mstats.groups()
+
+            res["output"] = {
+                "name": name,
+                "pi": int(pi),
+                "po": int(po),
+                "nodes": int(nodes),
+                "latches": int(latches),
+                "lits": int(lits),
+                "states": 0 if states is None else int(states)
+            }
+
+            res["success"] = True
+        elif t_stdout is not None and len(t_stdout.strip().splitlines()) == 2:
+            res["errors"].append("[ERROR][PRINT_STATS] Something went wrong "
+                                 "during print_stats' output parsing")
+        else:
+            res["errors"].append("[ERROR][PRINT_STATS] Something went wrong during print_stats execution")
+
+        return res
+
     def print_stats(self):
         """
         Executes SIS' print_stats command which outputs statistics about the circuit.
@@ -1119,56 +1460,20 @@ class Siswrapper:
 
         if self.started:
             if self.readsomething:
-                exec_res = self.exec("print_stats")
+                # the network didn't change since the last call
+                if self.stats_cache is not None and self.stats_cache[0] == self.network_version:
+                    return copy.deepcopy(self.stats_cache[1])
+
+                exec_res = self.memoized("print_stats", self.exec)
 
                 if exec_res["success"]:
-                    res["stdout"] = exec_res["stdout"]
-                    v_stdout = exec_res["stdout"].strip().split("\r\n")
-
-                    if len(v_stdout) == 2:
-                        pattern = r"^(\S*)[\s]*pi=[\s]*(\d*)[\s]*po=[\s]*(\d*)[\s]" \
-                                  r"*nodes=[\s]*(\d*)[\s]*latches=[\s]*(\d*)[\s]*$"
-                        infos = v_stdout[0]
-                        lits_states = v_stdout[1]
-                        mlits = re.match(r"lits\(sop\)=[\s]*(\d*).*", lits_states)
-                        mstates = re.match(r".*#states\(STG\)=[\s]*(\d*)", lits_states)
-                        minfos = re.match(pattern, infos)
-                        if minfos and mlits:
-                            try:
-                                infosgroups = minfos.groups()
-                                name = infosgroups[0]
-                                pi = int(infosgroups[1])
-                                po = int(infosgroups[2])
-                                nodes = int(infosgroups[3])
-                                latches = int(infosgroups[4])
-                                int_lits = int(mlits.groups()[0].strip())
-                                states = 0
-
-                                if mstates:
-                                    states = mstates.groups()[0].strip()
-                                    states = int(states)
-
-                                res["output"] = {
-                                    "name": name,
-                                    "pi": pi,
-                                    "po": po,
-                                    "nodes": nodes,
-                                    "latches": latches,
-                                    "lits": int_lits,
-                                    "states": states
-                                }
-
-                                res["success"] = True
-                            except ValueError:
-                                res["errors"].append("[ERROR][PRINT_STATS] Command returned something that is not a number")
-                        else:
-                            res["errors"].append("[ERROR][PRINT_STATS] Something went wrong "
-                                                 "during print_stats' output parsing")
-                    else:
-                        res["errors"].append("[ERROR][PRINT_STATS] Something went wrong during print_stats execution")
+                    res = self.parse_stats(exec_res["stdout"])
+
+                    if res["success"]:
+                        self.stats_cache = (self.network_version, copy.deepcopy(res))
                 else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][PRINT_STATS] Error during command execution: " + error)
+                    res["errors"].extend("[ERROR][PRINT_STATS] Error during command execution: " + error
+                                         for error in exec_res["errors"])
             else:
                 res["errors"].append("[ERROR][PRINT_STATS] Can't execute command: "
                                      "SIS has not read any files (use a read command first)")
@@ -1196,12 +1501,10 @@ class Siswrapper:
                 exec_res = self.exec("stg_to_network")
                 if exec_res["success"]:
                     res["stdout"] = exec_res["stdout"]
-
-                    if res["stdout"] is None:
-                        res["success"] = True
+                    res["success"] = self.check_output("stg_to_network", res["stdout"])["success"]
                 else:
-                    for error in exec_res["errors"]:
-                        res["errors"].append("[ERROR][STG_TO_NETWORK] Error during execution: " + error)
+                    res["errors"].extend("[ERROR][STG_TO_NETWORK] Error during execution: " + error
+                                         for error in exec_res["errors"])
             else:
                 res["errors"].append("[ERROR][STG_TO_NETWORK] Nothing to convert into a network "
                                      "(missing an input, use read_blif or another read command)")
@@ -1216,7 +1519,7 @@ class Siswrapper:
     #
     # ====================================================================================================
 
-    def simulate(self, inputs):  # noqa: C901
+    def simulate(self, inputs):
         """
         Executes SIS' simulate command to simulate a circuit.
 
@@ -1227,82 +1530,37 @@ class Siswrapper:
 
         if self.started:
             if self.readsomething:
-                accepted_chars = True
-                i = 0
-                while accepted_chars and i < len(inputs):
-                    if inputs[i] not in ["0", "1", " "]:
-                        accepted_chars = False
-                    i += 1
-
-                if accepted_chars:
-                    inputs = "".join([char + " " for char in inputs if char in ["0", "1"]]).strip()
+                if _SIMULATE_CHARS.issuperset(inputs):
+                    inputs = " ".join(inputs.replace(" ", ""))
 
                     exec_res = self.exec('simulate ' + inputs)
 
                     res["stdout"] = exec_res["stdout"]
 
                     if exec_res["success"]:
-                        v_stdout = exec_res["stdout"].strip().split("\r\n")
-
-                        if len(v_stdout) == 3:
-                            # simulating a network with no STGs
-                            if v_stdout[0] == "Network simulation:":
-                                outputs = v_stdout[1].replace("Outputs:", "").replace(" ", "")
-                                next_state = v_stdout[2].replace("Next state:", "")
-
-                                res["success"] = True
-
-                                res["output"] = {
-                                    "outputs": outputs.strip(),
-                                    "next_state": next_state.strip()
-                                }
-                            else:
-                                stats = self.print_stats()
-                                n_net_inputs = stats["output"]["pi"]
+                        v_stdout = [line.strip() for line in (exec_res["stdout"] or "").strip().splitlines()]
 
-                                if "simulate network: network has {} inputs;".format(n_net_inputs) in v_stdout[0]:
-                                    res["errors"].append(v_stdout[0])
-                                else:
-                                    res["errors"].append("[ERROR][SIMULATE] Something went wrong during simulation")
-                        elif len(v_stdout) == 7:
-                            # simulating a network with an STG (FSM)
-                            if v_stdout[0] == "Network simulation:" and v_stdout[4] == "STG simulation:":
-                                outputs = v_stdout[1].replace("Outputs:", "").replace(" ", "")
-                                next_state = v_stdout[2].replace("Next state:", "")
-
-                                stg_outputs = v_stdout[5].replace("Outputs:", "").replace(" ", "")
-                                stg_next_state = v_stdout[6].replace("Next state:", "")
-
-                                res["success"] = True
-
-                                res["output"] = {
-                                    "outputs": outputs.strip(),
-                                    "next_state": next_state.strip(),
-                                    "stg_outputs": stg_outputs.strip(),
-                                    "stg_next_state": stg_next_state.strip()
-                                }
-                            else:
-                                stats = self.print_stats()
-                                n_net_inputs = stats["output"]["pi"]
+                        parser = _SIMULATE_PARSERS.get(len(v_stdout))
+                        output = parser(v_stdout) if parser else None
 
-                                if "simulate network: network has {} inputs;".format(n_net_inputs) in v_stdout[0]:
-                                    res["errors"].append(v_stdout[0])
-                                else:
-                                    res["errors"].append("[ERROR][SIMULATE] Something went wrong during simulation")
-                        else:
+                        if output is not None:
+                            res["success"] = True
+                            res["output"] = output
+                        elif v_stdout:
                             try:
-                                stats = self.print_stats()
-                                n_net_inputs = stats["output"]["pi"]
+                                n_net_inputs = self.print_stats()["output"]["pi"]
 
                                 if "simulate network: network has {} inputs;".format(n_net_inputs) in v_stdout[0]:
                                     res["errors"].append(v_stdout[0])
                                 else:
                                     res["errors"].append("[ERROR][SIMULATE] Something went wrong during simulation")
-                            except KeyError:
+                            except (KeyError, TypeError):
                                 res["errors"].append("[ERROR][SIMULATE] Something went wrong during simulation check")
+                        else:
+                            res["errors"].append("[ERROR][SIMULATE] Something went wrong during simulation")
                     else:
-                        for error in exec_res["errors"]:
-                            res["errors"].append("[ERROR][SIMULATE] Error during command execution: " + error)
+                        res["errors"].extend("[ERROR][SIMULATE] Error during command execution: " + error
+                                             for error in exec_res["errors"])
                 else:
                     res["errors"].append("[ERROR][SIMULATE] Invalid inputs (accepted inputs are made of 1s and 0s)")
             else:
@@ -1314,6 +1572,267 @@ class Siswrapper:
         return res
 
 
+def _coroutine_method(name):
+    """
+    Returns a coroutine function that executes the <name> Siswrapper method
+    inside the worker thread of an AsyncSiswrapper instance.
+
+    :param str name: name of the Siswrapper method
+    :return function method: coroutine function that returns the method's results
+    """
+    async def method(self, *args, **kwargs):
+        return await self.run(getattr(self.siswrapper, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = "Coroutine version of the Siswrapper.{}() method.".format(name)
+    return method
+
+
+class AsyncSiswrapper:
+    """
+    Initializes an asyncio wrapper for a SIS process.
+
+    SIS needs a terminal to show its prompt and to flush its output,
+    so the process is still controlled by a Siswrapper instance (and pexpect):
+    the blocking methods are executed, in order, by a worker thread
+    dedicated to this instance.
+    This way one event loop can control many SIS processes concurrently.
+
+    Use "await AsyncSiswrapper.create()" to obtain an instance with a running SIS process.
+
+    Shared variables:
+    * siswrapper: Siswrapper instance that controls SIS's process (None until start() is awaited)
+    * siswrapper_args: (args, kwargs) passed to the Siswrapper constructor
+    * executor: single thread executor that runs the Siswrapper methods (None after stop() until it's needed again)
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.siswrapper = None
+        self.siswrapper_args = (args, kwargs)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        """
+        Returns a new AsyncSiswrapper instance with SIS's process started.
+
+        The parameters are passed to the Siswrapper constructor.
+
+        :return AsyncSiswrapper instance: the new instance (check instance.siswrapper.res for errors)
+        """
+        instance = cls(*args, **kwargs)
+        await instance.start()
+        return instance
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Executes <function> inside the worker thread of this instance.
+
+        :param function function: function to execute (usually a Siswrapper method)
+        :return: the value returned by function
+        """
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def start(self):
+        """
+        Starts SIS's process (the first call creates the Siswrapper instance).
+
+        :return dict res: results of the operation (success, errors, stdout)
+        """
+        if self.siswrapper is None:
+            args, kwargs = self.siswrapper_args
+            self.siswrapper = await self.run(Siswrapper, *args, **kwargs)
+            return self.siswrapper.res
+
+        return await self.run(self.siswrapper.start)
+
+    async def stop(self):
+        """
+        Stops SIS's process and the worker thread of this instance
+        (start() creates a new worker thread).
+
+        :return dict res: results of the operation (success, errors, stdout)
+        """
+        if self.siswrapper is None:
+            # start() has never been awaited
+            return {"success": False, "errors": ["[ERROR][STOP] Can't stop SIS: SIS's process is not running"],
+                    "stdout": None}
+
+        res = await self.run(self.siswrapper.stop)
+
+        # the worker thread has nothing left to execute: the wait doesn't block the event loop
+        self.executor.shutdown(wait=True)
+        self.executor = None
+        return res
+
+    reset = _coroutine_method("reset")
+    exec = _coroutine_method("exec")
+    parsed_exec = _coroutine_method("parsed_exec")
+    cached_exec = _coroutine_method("cached_exec")
+    exec_with_stats = _coroutine_method("exec_with_stats")
+    read_file = _coroutine_method("read_file")
+    read_blif = _coroutine_method("read_blif")
+    read_eqn = _coroutine_method("read_eqn")
+    write_file = _coroutine_method("write_file")
+    write_blif = _coroutine_method("write_blif")
+    write_eqn = _coroutine_method("write_eqn")
+    script_rugged = _coroutine_method("script_rugged")
+    bsisscript_fsm = _coroutine_method("bsisscript_fsm")
+    bsisscript_lgate = _coroutine_method("bsisscript_lgate")
+    bsisscript_fsmd = _coroutine_method("bsisscript_fsmd")
+    print_stats = _coroutine_method("print_stats")
+    stg_to_network = _coroutine_method("stg_to_network")
+    simulate = _coroutine_method("simulate")
+
+
+class SiswrapperPool:
+    """
+    Initializes a pool of Siswrapper instances (one SIS process each)
+    to execute independent jobs concurrently.
+
+    A job is a function that receives a free Siswrapper instance and returns a result:
+    the instances are reused, so a job should always start by reading its input.
+
+    Shared variables:
+    * res: dictionary with results of the start operation (success, errors, stdout)
+    * size: number of requested Siswrapper instances
+    * workers: list of Siswrapper instances with a running SIS process (the ones that can't start are discarded)
+    * free: queue with the instances that are not executing a job
+    * executor: thread pool that executes the jobs submitted with map() and submit_async()
+
+    :param int size: number of SIS processes (None = number of CPUs)
+    :param kwargs: keyword arguments passed to the Siswrapper constructor (for example cache_dir)
+    """
+
+    def __init__(self, size=None, **kwargs):
+        self.res = {"success": True, "errors": [], "stdout": None}
+        self.size = size or os.cpu_count() or 1
+        self.workers = []
+        self.free = queue.Queue()
+
+        for _ in range(self.size):
+            worker = Siswrapper(**kwargs)
+
+            if worker.started:
+                self.workers.append(worker)
+                self.free.put(worker)
+            else:
+                self.res["success"] = False
+                self.res["errors"].extend("[ERROR][POOL_INIT] Error while starting a SIS process: " + error
+                                          for error in worker.res["errors"])
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.size)
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """
+        Context manager that gives a free Siswrapper instance (waits if there isn't one)
+        and gives it back to the pool at the end of the with block.
+        Before being given back the instance is restored (see restore()):
+        if its SIS process can't be started again the instance is removed from the pool.
+
+        Usage: "with pool.acquire() as sis:"
+
+        :return Siswrapper worker: Siswrapper instance with a running SIS process
+        """
+        if not self.workers:
+            raise Exception("The pool has no running SIS processes")
+
+        worker = self.free.get()
+        try:
+            yield worker
+        finally:
+            if self.restore(worker)["success"]:
+                self.free.put(worker)
+            else:
+                self.workers.remove(worker)
+
+    def restore(self, t_worker):
+        """
+        Forgets the state left in the <t_worker> instance by the last job
+        (read file, partial results suffix and cached results).
+
+        SIS's process and its working directory are kept:
+        the next job doesn't wait for a new process (and a read from the same folder doesn't restart SIS).
+        The process is started again only if the job stopped it.
+
+        :param Siswrapper t_worker: Siswrapper instance of the pool
+        :return dict res: results of the operation (success, errors, stdout)
+        """
+        t_worker.readsomething = False
+        t_worker.read_path = None
+        t_worker.read_path_parts = None
+        t_worker.read_cache = None
+        t_worker.stats_cache = None
+        t_worker.fingerprint_cache = None
+        t_worker.caching = False
+        t_worker.partial_suffix = ""
+
+        # SIS still contains the network of the last job
+        t_worker.network_version += 1
+
+        if t_worker.started:
+            return {"success": True, "errors": [], "stdout": None}
+
+        return t_worker.start()
+
+    def submit(self, function):
+        """
+        Executes function(siswrapper) using a free Siswrapper instance (waits if there isn't one).
+
+        :param function function: job to execute, receives the Siswrapper instance
+        :return: the value returned by function
+        """
+        with self.acquire() as worker:
+            return function(worker)
+
+    def map(self, function, iterable):
+        """
+        Executes function(siswrapper, item) for each item of <iterable>, concurrently.
+
+        :param function function: job to execute, receives the Siswrapper instance and the item
+        :param iterable iterable: items to process (for example paths of .blif files)
+        :return list results: values returned by function, in the same order of the items
+        """
+        def job(item):
+            return self.submit(lambda worker: function(worker, item))
+
+        return list(self.executor.map(job, iterable))
+
+    async def submit_async(self, function):
+        """
+        Coroutine version of the submit() method.
+
+        :param function function: job to execute, receives the Siswrapper instance
+        :return: the value returned by function
+        """
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self.executor, self.submit, function)
+
+    def stop(self):
+        """
+        Stops all the SIS processes of the pool.
+
+        :return dict res: results of the operation (success, errors, stdout)
+        """
+        res = {"success": True, "errors": [], "stdout": None}
+
+        self.executor.shutdown()
+
+        for worker in self.workers:
+            stop_res = worker.stop()
+            if not stop_res["success"]:
+                res["success"] = False
+                res["errors"].extend("[ERROR][POOL_STOP] Error while stopping a SIS process: " + error
+                                     for error in stop_res["errors"])
+
+        return res
+
+
 if __name__ == "__main__":
 
     sis = Siswrapper()
@@ -8,28 +8,55 @@ UNIT_TESTS: tests siswrapper
 __author__ = "Zenaro Stefano"
 __version__ = "2020-11-14 1.0.0"
 
+import asyncio
+import functools
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from unittest import mock
 
 # import siswrapper from the ../siswrapper folder
 curr_dir = os.path.realpath(os.path.dirname(__file__))
-siswrapper_path = os.path.join(curr_dir, "..", "siswrapper")
-sys.path.insert(1, os.path.realpath(siswrapper_path))
+# (curr_dir is already a real path: its parent doesn't need to be resolved again)
+siswrapper_path = os.path.join(os.path.dirname(curr_dir), "siswrapper")
+sys.path.insert(1, siswrapper_path)
 import siswrapper as sw
 
-boold = True
+# input files used by the tests
+and_blif = os.path.join(curr_dir, "and.blif")
+and_eqn = os.path.join(curr_dir, "and.eqn")
+automa_blif = os.path.join(curr_dir, "automa.blif")
+automa_noencoding_blif = os.path.join(curr_dir, "automa_noencoding.blif")
+err_blif = os.path.join(curr_dir, "err.blif")
+
+# str_to_numbers() test cases (built once, str_to_numbers() doesn't modify its input)
+str_to_numbers_tests = (
+    {"i": (), "o": {"output": [], "errors": []}},
+    {"i": ("",), "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
+    {"i": ("a",), "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
+    {"i": ("1", "0", "a"), "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
+    {"i": ("0", "1", "4"), "o": {"output": [0, 1, 4], "errors": []}},
+    {"i": ("123456789",), "o": {"output": [123456789], "errors": []}},
+)
+
+
+@functools.lru_cache(maxsize=None)
+def read_terminal_text(t_path):
+    """
+    Returns the content of the <t_path> input file as SIS shows it in the terminal (CRLF line endings).
+    The input files are never modified: each file is read only once.
+
+    :param str t_path: path to the file
+    :return str content: content of the file
+    """
+    with open(t_path, "r") as f:
+        return f.read().replace("\n", "\r\n")
 
 
 class TestUtils(unittest.TestCase):
 
-    def test_productionenv(self):
-        """
-        Makes sure we are running in production mode (when boold is False).
-        """
-        if not boold:
-            self.assertFalse(sw.boold)
-
     def test_string_to_list(self):
         """
         Tests string_to_list() function.
@@ -44,16 +71,13 @@ class TestUtils(unittest.TestCase):
         ]
 
         for test in tests:
+            with self.subTest(test=test):
+                if test["i2"]:
+                    res = sw.string_to_list(test["i1"], test["i2"])
+                else:
+                    res = sw.string_to_list(test["i1"])
 
-            assert "i1" in test, ("Not well formatted input for testing ('i1' is missing in \"{}\")".format(test))
-            assert "o" in test, ("Not well formatted input for testing ('o' is missing in \"{}\")".format(test))
-
-            if test["i2"]:
-                res = sw.string_to_list(test["i1"], test["i2"])
-            else:
-                res = sw.string_to_list(test["i1"])
-
-            self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
+                self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
 
     def test_remove_empty_els(self):
         """
@@ -69,40 +93,69 @@ class TestUtils(unittest.TestCase):
         ]
 
         for test in tests:
-            assert "i" in test, ("Not well formatted input for testing ('i' is missing in \"{}\")".format(test))
-            assert "o" in test, ("Not well formatted input for testing ('o' is missing in \"{}\")".format(test))
-
-            res = sw.remove_empty_els(test["i"])
-            self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
+            with self.subTest(test=test):
+                res = sw.remove_empty_els(test["i"])
+                self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
 
     def test_str_to_numbers(self):
         """
         Tests str_to_numbers() function.
         Converts list of numeric strings into a list of integers.
         """
+        for test in str_to_numbers_tests:
+            with self.subTest(test=test):
+                res = sw.str_to_numbers(test["i"])
+                self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
+
+    def test_removeprefix(self):
+        """
+        Tests removeprefix() function.
+        Removes a prefix from a string (if the string starts with it).
+        """
         tests = [
-            {"i": [], "o": {"output": [], "errors": []}},
-            {"i": [""], "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
-            {"i": ["a"], "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
-            {"i": ["1", "0", "a"], "o": {"output": [], "errors": ["Element(s) is/are not a number"]}},
-            {"i": ["0", "1", "4"], "o": {"output": [0, 1, 4], "errors": []}},
-            {"i": ["123456789"], "o": {"output": [123456789], "errors": []}},
+            {"i1": "", "i2": "", "o": ""},
+            {"i1": "print_stats", "i2": "", "o": "print_stats"},
+            {"i1": "print_stats", "i2": "print_", "o": "stats"},
+            {"i1": "print_stats", "i2": "stats", "o": "print_stats"},
+            {"i1": "print_stats", "i2": "print_stats", "o": ""},
         ]
 
         for test in tests:
-            assert "i" in test, ("Not well formatted input for testing ('i' is missing in \"{}\")".format(test))
-            assert "o" in test, ("Not well formatted input for testing ('o' is missing in \"{}\")".format(test))
+            with self.subTest(test=test):
+                res = sw.removeprefix(test["i1"], test["i2"])
+                self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
 
-            res = sw.str_to_numbers(test["i"])
-            self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
+    def test_removesuffix(self):
+        """
+        Tests removesuffix() function.
+        Removes a suffix from a string (if the string ends with it).
+        """
+        tests = [
+            {"i1": "", "i2": "", "o": ""},
+            {"i1": "and.blif", "i2": "", "o": "and.blif"},
+            {"i1": "and.blif", "i2": ".blif", "o": "and"},
+            {"i1": "and.blif", "i2": "and", "o": "and.blif"},
+            {"i1": "and.blif", "i2": "and.blif", "o": ""},
+        ]
 
-    @unittest.skip("TODO: write tests")
-    def test_removeprefix(self):
-        pass
+        for test in tests:
+            with self.subTest(test=test):
+                res = sw.removesuffix(test["i1"], test["i2"])
+                self.assertEqual(res, test["o"], "error during test: \"{}\"".format(test))
 
-    @unittest.skip("TODO: write tests")
-    def test_removesuffix(self):
-        pass
+    def test_parse_stg_simulation(self):
+        """
+        Tests parse_stg_simulation() function.
+        Parses the output of the simulate command of a network with an STG.
+        """
+        lines = ["Network simulation:", "Outputs: 0 1", "Next state: 01", "",
+                 "STG simulation:", "Outputs: 0 1", "Next state: st1"]
+
+        res = sw.parse_stg_simulation(lines)
+        self.assertEqual(res, {"outputs": "01", "next_state": "01", "stg_outputs": "01", "stg_next_state": "st1"})
+
+        lines[4] = "Something else:"
+        self.assertIsNone(sw.parse_stg_simulation(lines), "lines are not a STG simulation")
 
 
 class TestSiswrapper(unittest.TestCase):
@@ -116,79 +169,17 @@ class TestSiswrapper(unittest.TestCase):
         self.assertTrue(self.sw_session.started, "sis session should be running")
         self.assertFalse(self.sw_session.readsomething, "sis should be waiting to read an input")
         self.assertTrue(self.sw_session.res["success"], "sis session should be started successfully")
-        self.assertEqual(self.sw_session.res["errors"], [], "there should be no errors when the session starts")
-
-    def test_start(self):
-        """
-        Tests start() method, should fail because the session is already up and running.
-        After the first fail the session is closed and then opened again.
-        """
-        # try to start the session manually while session is already running
-        res = self.sw_session.start()
-        self.assertFalse(res["success"], "action should fail, session is already running")
-        self.assertIn("[ERROR][START] Couldn't start SIS: SIS's process is already running in this instance",
-                      res["errors"], "error should be inside the errors list")
-        self.assertTrue(self.sw_session.started, "sis session should still be running")
-
-        # stop the session manually so that we can test start()
-        res = self.sw_session.stop()
-        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertFalse(self.sw_session.started, "sis sessions should be stopped")
-
-        # start a session manually
-        res = self.sw_session.start()
-        self.assertTrue(res["success"], "action should be successfull, session can start")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertTrue(self.sw_session.started, "sis session should be running again")
+        self.assertFalse(self.sw_session.res["errors"], "there should be no errors when the session starts")
 
-    def test_stop(self):
+    def stop_session(self):
         """
-        Tests stop() method, should be successfull the first call.
-        After that calling stop() a second time should fail.
+        Stops the session, the process should stop without errors.
         """
-        # stop the session
         res = self.sw_session.stop()
         self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertFalse(self.sw_session.started, "tmux and sis sessions should be stopped")
-
-        # try to stop it again
-        res = self.sw_session.stop()
-        self.assertFalse(res["success"], "action should fail, session is not running")
-        self.assertIn("[ERROR][STOP] Can't stop SIS: SIS's process is not running",
-                      res["errors"], "error should be inside the errors list")
-        self.assertFalse(self.sw_session.started, "tmux and sis sessions should still be stopped")
-
-    def test_reset(self):
-        """
-        Tests reset() method, should be successfull while the session is running.
-        When the session is stopped, reset() should fail.
-        """
-        # try to reset the session
-        res = self.sw_session.reset()
-        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertTrue(self.sw_session.started, "sis session should be up and running")
-
-        # reset again
-        res = self.sw_session.reset()
-        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertTrue(self.sw_session.started, "sis session should be up and running")
-
-        # stop the session
-        res = self.sw_session.stop()
-        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
+        self.assertFalse(res["errors"], "there should be no errors")
         self.assertFalse(self.sw_session.started, "sis session should be stopped")
 
-        # try to reset while the session is stopped
-        error = "[ERROR][RESET] Error while resetting (stop step): [ERROR][STOP] Can't stop SIS: SIS's process is not running"
-        res = self.sw_session.reset()
-        self.assertFalse(res["success"], "action should fail, session is not running")
-        self.assertIn(error, res["errors"], "there should be an error")
-
     @unittest.skip("TODO: write tests")
     def test_wait_end_command(self):
         pass
@@ -197,6 +188,21 @@ class TestSiswrapper(unittest.TestCase):
     def test_exec(self):
         pass
 
+    def test_exec_batch(self):
+        """
+        Tests exec_batch() method, the output of each command should be returned separately.
+        """
+        file_path = and_blif
+        res = self.sw_session.read_blif(file_path)
+        self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+        res = self.sw_session.exec_batch(["print_stats", "source script.rugged", "print_stats"])
+        self.assertTrue(res["success"], "action should be successfull")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertEqual(len(res["output"]), 3, "there should be the output of each command")
+        self.assertTrue(res["output"][0].startswith("and"), "print_stats output should start with the network name")
+        self.assertIsNone(res["output"][1], "script.rugged should not print anything")
+
     @unittest.skip("TODO: write tests")
     def test_parsed_exec(self):
         pass
@@ -220,47 +226,227 @@ class TestSiswrapper(unittest.TestCase):
         Tests read_blif() method, should be successfull when the session is running
         and when the input file exists.
         """
-        # generate a random file name that points to a file that doesn't exist
-        random_name = "file.that.does.not.exist"
-        while os.path.isfile(random_name):
-            random_name = os.urandom(10).hex()
-
-        # try to open the file that doesn't exist
-        file_path = os.path.join(curr_dir, random_name)
-        res = self.sw_session.read_blif(file_path)
-        self.assertFalse(res["success"], "action should fail, file doesn't exist")
-        self.assertIn("[ERROR][READ_BLIF] '{}' file doesn't exist".format(file_path),
-                      res["errors"], "there should be an error")
+        # try to open a file that doesn't exist (nothing is created inside the new temporary directory)
+        with tempfile.TemporaryDirectory() as missing_dir:
+            # read_blif() reports the real path of the file
+            file_path = os.path.join(os.path.realpath(missing_dir), "nonexistent.blif")
+            res = self.sw_session.read_blif(file_path)
+            self.assertFalse(res["success"], "action should fail, file doesn't exist")
+            self.assertIn("[ERROR][READ_BLIF] '{}' file doesn't exist".format(file_path),
+                          res["errors"], "there should be an error")
 
         # try to open a file that exists but not formatted correctly
-        file_path = os.path.join(curr_dir, "err.blif")
+        file_path = err_blif
         res = self.sw_session.read_blif(file_path)
         self.assertFalse(res["success"], "action should fail, file is not formatted correctly")
         self.assertIn('"{}", line 5: bad character in PLA table'.format(file_path), res["errors"], "there should be an error")
 
         # try to open a file that exists and is well formatted
-        file_path = os.path.join(curr_dir, "and.blif")
+        file_path = and_blif
         res = self.sw_session.read_blif(file_path)
         self.assertTrue(res["success"], "action should be successfull")
-        self.assertEqual(res["errors"], [], "there should be no errors")
+        self.assertFalse(res["errors"], "there should be no errors")
 
         # stop the session
-        res = self.sw_session.stop()
-        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
-        self.assertEqual(res["errors"], [], "there should be no errors")
-        self.assertFalse(self.sw_session.started, "sis session should be stopped")
+        self.stop_session()
 
         # try to open the file that exists and is well formatted while the session is closed
-        file_path = os.path.join(curr_dir, "and.blif")
+        file_path = and_blif
         res = self.sw_session.read_blif(file_path)
         self.assertFalse(res["success"], "action should fail, session is closed")
         self.assertIn("[ERROR][READ_BLIF] Can't execute command: SIS's process is not running",
                       res["errors"], "there should be an error")
 
+    def test_exec_with_stats(self):
+        """
+        Tests exec_with_stats() method, the command and print_stats results should be returned separately.
+        """
+        file_path = and_blif
+        res = self.sw_session.read_blif(file_path)
+        self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+        cmd_res, stats_res = self.sw_session.exec_with_stats("source script.rugged")
+        self.assertTrue(cmd_res["success"], "action should be successful")
+        self.assertTrue(stats_res["success"], "print_stats execution should be successfull")
+        self.assertEqual(stats_res["output"]["name"], "and")
+        self.assertEqual(self.sw_session.print_stats(), stats_res, "print_stats results should be reused")
+
+    def test_read_blif_cache(self):
+        """
+        Tests that reading again the same file when the network didn't change doesn't execute read_blif again.
+        """
+        file_path = and_blif
+        res = self.sw_session.read_blif(file_path)
+        self.assertTrue(res["success"], "action should be successfull")
+        network_version = self.sw_session.network_version
+
+        # same file, same network: nothing is executed
+        cached_res = self.sw_session.read_blif(file_path)
+        self.assertEqual(cached_res, res, "results should be the same as the first read")
+        self.assertEqual(self.sw_session.network_version, network_version, "network should not change")
+
+        # print_stats doesn't change the network
+        self.sw_session.print_stats()
+        self.sw_session.read_blif(file_path)
+        self.assertEqual(self.sw_session.network_version, network_version, "network should not change")
+
+        # simulate moves the current state of sequential networks: the file has to be read again
+        self.sw_session.simulate("00")
+        self.sw_session.read_blif(file_path)
+        self.assertNotEqual(self.sw_session.network_version, network_version, "file should be read again")
+        network_version = self.sw_session.network_version
+
+        # the network changed: the file has to be read again
+        self.sw_session.script_rugged()
+        res = self.sw_session.read_blif(file_path)
+        self.assertTrue(res["success"], "action should be successfull")
+        self.assertNotEqual(self.sw_session.network_version, network_version, "file should be read again")
+
     @unittest.skip("TODO: write tests")
     def test_read_eqn(self):
         pass
 
+    # ====================================================================================================
+    #
+    #                                        SCRIPTS METHODS
+    #
+    # ====================================================================================================
+
+    @unittest.skip("TODO: write tests")
+    def test_script_rugged(self):
+        pass
+
+    def test_cached_exec(self):
+        """
+        Tests that cached_exec() caches the result of a command and the resulting network.
+        """
+        file_path = and_blif
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.sw_session.cache_dir = cache_dir
+
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+            rugged_res = self.sw_session.cached_exec("source script.rugged")
+            self.assertTrue(rugged_res["success"], "action should be successful")
+            cache_files = sorted(os.listdir(cache_dir))
+            self.assertEqual(len(cache_files), 2, "the results and the network should be cached")
+
+            # same command on the same network: the cached results are used
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+            cached_res = self.sw_session.cached_exec("source script.rugged")
+            self.assertEqual(cached_res, rugged_res, "cached results should be returned")
+            self.assertEqual(sorted(os.listdir(cache_dir)), cache_files, "nothing new should be cached")
+
+    def test_memoized_print_stats(self):
+        """
+        Tests that print_stats() results are cached without caching the network (print_stats doesn't modify it).
+        """
+        file_path = and_blif
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.sw_session.cache_dir = cache_dir
+
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+            stats_res = self.sw_session.print_stats()
+            self.assertTrue(stats_res["success"], "action should be successful")
+            self.assertEqual(len(os.listdir(cache_dir)), 1, "only the results should be cached")
+
+            cached_res = self.sw_session.print_stats()
+            self.assertEqual(cached_res, stats_res, "cached results should be returned")
+            self.assertEqual(len(os.listdir(cache_dir)), 1, "nothing new should be cached")
+
+    def test_fail_fast(self):
+        """
+        Tests that with fail_fast the steps after a failed step are skipped.
+        """
+        with tempfile.TemporaryDirectory() as work_dir:
+            # bsisscript_fsm() writes the partial results next to the input file
+            file_path = os.path.join(work_dir, "automa_noencoding.blif")
+            shutil.copy(automa_noencoding_blif, file_path)
+
+            self.sw_session.cache_dir = os.path.join(work_dir, "cache")
+            self.sw_session.fail_fast = True
+
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+            res = self.sw_session.bsisscript_fsm(autoencoding=False, opt_area=True)
+            self.assertFalse(res["success"], "stg_to_network should fail")
+            self.assertIn("sis> source script.rugged (skipped)", res["stdout"])
+            self.assertNotIn("5_map_stats", res["output"])
+
+    def test_fail_fast_batch(self):
+        """
+        Tests that without a cache the steps that SIS didn't execute are skipped (fail_fast is the default)
+        and that they are executed when fail_fast is False.
+        """
+        self.assertTrue(self.sw_session.fail_fast, "fail_fast should be enabled by default")
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            file_path = os.path.join(work_dir, "automa_noencoding.blif")
+            shutil.copy(automa_noencoding_blif, file_path)
+
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+            res = self.sw_session.bsisscript_fsm(autoencoding=False, opt_area=True)
+            self.assertFalse(res["success"], "stg_to_network should fail")
+            self.assertIn("sis> source script.rugged (skipped)", res["stdout"])
+            self.assertNotIn("5_map_stats", res["output"])
+
+            self.sw_session.fail_fast = False
+            res = self.sw_session.read_blif(file_path)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+
+            res = self.sw_session.bsisscript_fsm(autoencoding=False, opt_area=True)
+            self.assertFalse(res["success"], "stg_to_network should fail")
+            self.assertNotIn("(skipped)", res["stdout"])
+            self.assertIn("5_map_stats", res["output"])
+
+    @unittest.skip("TODO: write tests")
+    def test_bsisscript_fsm(self):
+        pass
+
+    @unittest.skip("TODO: write tests")
+    def test_bsisscript_lgate(self):
+        pass
+
+    @unittest.skip("TODO: write tests")
+    def test_bsisscript_fsmd(self):
+        pass
+
+
+class TestSiswrapperShared(unittest.TestCase):
+    """
+    Tests that don't start/stop SIS: they share a single SIS session
+    (each test reads the network it needs).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Initializes the Siswrapper object shared by the tests of the class.
+        """
+        cls.sw_session = sw.Siswrapper()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Stops the shared Siswrapper object.
+        """
+        cls.sw_session.stop()
+
+    def setUp(self):
+        """
+        Makes sure the shared session is still running.
+        """
+        self.assertTrue(self.sw_session.started, "sis session should be running")
+
     # ====================================================================================================
     #
     #                                          WRITE METHODS
@@ -271,10 +457,9 @@ class TestSiswrapper(unittest.TestCase):
         """
         Tests the write_blif command.
         """
-        file_path = os.path.join(curr_dir, "and.blif")
+        file_path = and_blif
 
-        with open(file_path, "r") as f:
-            and_content = f.read().replace("\n", "\r\n")
+        and_content = read_terminal_text(file_path)
 
         res = self.sw_session.read_blif(file_path)
         self.assertTrue(res["success"], "action should be successful")
@@ -287,10 +472,9 @@ class TestSiswrapper(unittest.TestCase):
         """
         Tests the write_eqn command.
         """
-        file_path = os.path.join(curr_dir, "and.eqn")
+        file_path = and_eqn
 
-        with open(file_path, "r") as f:
-            and_content = f.read().replace("\n", "\r\n")
+        and_content = read_terminal_text(file_path)
 
         res = self.sw_session.read_eqn(file_path)
         self.assertTrue(res["success"], "action should be successful")
@@ -299,28 +483,6 @@ class TestSiswrapper(unittest.TestCase):
         self.assertTrue(res["success"], "action should be successful")
         self.assertEqual(res["stdout"].strip(), and_content.strip())
 
-    # ====================================================================================================
-    #
-    #                                        SCRIPTS METHODS
-    #
-    # ====================================================================================================
-
-    @unittest.skip("TODO: write tests")
-    def test_script_rugged(self):
-        pass
-
-    @unittest.skip("TODO: write tests")
-    def test_bsisscript_fsm(self):
-        pass
-
-    @unittest.skip("TODO: write tests")
-    def test_bsisscript_lgate(self):
-        pass
-
-    @unittest.skip("TODO: write tests")
-    def test_bsisscript_fsmd(self):
-        pass
-
     # ====================================================================================================
     #
     #                                          FSM METHODS
@@ -329,7 +491,7 @@ class TestSiswrapper(unittest.TestCase):
 
     def test_stg_to_network(self):
         # FSM with encoding
-        file_path = os.path.join(curr_dir, "automa.blif")
+        file_path = automa_blif
         cmd_res = self.sw_session.read_blif(file_path)
         self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
 
@@ -337,7 +499,7 @@ class TestSiswrapper(unittest.TestCase):
         self.assertTrue(cmd_res["success"], "stg_to_network execution should be successfull")
 
         # same FSM but without encoding
-        file_path = os.path.join(curr_dir, "automa_noencoding.blif")
+        file_path = automa_noencoding_blif
         cmd_res = self.sw_session.read_blif(file_path)
         self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
 
@@ -352,7 +514,7 @@ class TestSiswrapper(unittest.TestCase):
 
     def test_print_stats(self):
         # Circuit with no STG
-        file_path = os.path.join(curr_dir, "and.blif")
+        file_path = and_blif
         cmd_res = self.sw_session.read_blif(file_path)
         self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
 
@@ -368,7 +530,7 @@ class TestSiswrapper(unittest.TestCase):
         self.assertEqual(cmd_res["output"]["states"], 0)
 
         # Circuit with an STG
-        file_path = os.path.join(curr_dir, "automa.blif")
+        file_path = automa_blif
         cmd_res = self.sw_session.read_blif(file_path)
         self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
 
@@ -391,7 +553,7 @@ class TestSiswrapper(unittest.TestCase):
 
     def test_simulate(self):
         # Circuit with no STG
-        file_path = os.path.join(curr_dir, "and.blif")
+        file_path = and_blif
         cmd_res = self.sw_session.read_blif(file_path)
         self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
 
@@ -408,5 +570,455 @@ class TestSiswrapper(unittest.TestCase):
         self.assertEqual(cmd_res["output"]["outputs"], "0")
 
 
+class TestSiswrapperMocked(unittest.TestCase):
+    """
+    Tests the parsing of SIS' outputs without spawning SIS (exec() returns canned outputs).
+    """
+
+    def setUp(self):
+        """
+        Initializes a Siswrapper object without starting SIS.
+        """
+        start_res = {"success": True, "errors": [], "stdout": None}
+        with mock.patch.object(sw.Siswrapper, "start", return_value=start_res):
+            self.sw_session = sw.Siswrapper()
+
+        # the files are already inside SIS' working directory: no restart is needed
+        self.sw_session.cwd = curr_dir
+        self.assertTrue(self.sw_session.started, "sis session should be running")
+
+    def start_fake_session(self):
+        """
+        Starts the session with a fake SIS process that exits after the quit command
+        (pexpect.spawn() stays patched until the end of the test).
+        """
+        self.process = mock.MagicMock()
+        self.process.expect_exact.return_value = 0
+        self.process.before = "UC Berkeley, SIS 1.3.6\r\n"
+        self.process.isalive.return_value = False
+
+        patcher = mock.patch.object(sw.pexpect, "spawn", return_value=self.process)
+        self.spawn_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sw_session.started = False
+        res = self.sw_session.start()
+        self.assertTrue(res["success"], "action should be successfull, session can start")
+        self.assertTrue(self.sw_session.started, "sis session should be running")
+
+    def stop_session(self):
+        """
+        Stops the session, the process should stop without errors.
+        """
+        res = self.sw_session.stop()
+        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertFalse(self.sw_session.started, "sis session should be stopped")
+
+    def test_start(self):
+        """
+        Tests start() method, should fail because the session is already up and running.
+        After the first fail the session is closed and then opened again.
+        """
+        self.start_fake_session()
+
+        # try to start the session manually while session is already running
+        res = self.sw_session.start()
+        self.assertFalse(res["success"], "action should fail, session is already running")
+        self.assertIn("[ERROR][START] Couldn't start SIS: SIS's process is already running in this instance",
+                      res["errors"], "error should be inside the errors list")
+        self.assertTrue(self.sw_session.started, "sis session should still be running")
+
+        # stop the session manually so that we can test start()
+        self.stop_session()
+
+        # start a session manually
+        res = self.sw_session.start()
+        self.assertTrue(res["success"], "action should be successfull, session can start")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertTrue(self.sw_session.started, "sis session should be running again")
+        self.assertEqual(self.spawn_mock.call_count, 2, "SIS should be started again")
+
+        # SIS is not installed
+        self.stop_session()
+        self.spawn_mock.side_effect = sw.pexpect.exceptions.ExceptionPexpect("sis")
+        res = self.sw_session.start()
+        self.assertFalse(res["success"], "action should fail, SIS can't be spawned")
+        self.assertFalse(self.sw_session.started, "sis session should not be running")
+
+    def test_stop(self):
+        """
+        Tests stop() method, should be successfull the first call.
+        After that calling stop() a second time should fail.
+        """
+        self.start_fake_session()
+
+        # stop the session
+        self.stop_session()
+
+        # try to stop it again
+        res = self.sw_session.stop()
+        self.assertFalse(res["success"], "action should fail, session is not running")
+        self.assertIn("[ERROR][STOP] Can't stop SIS: SIS's process is not running",
+                      res["errors"], "error should be inside the errors list")
+        self.assertFalse(self.sw_session.started, "sis session should still be stopped")
+
+        # SIS ignores the quit command: the process is terminated
+        self.sw_session.start()
+        self.process.isalive.side_effect = [True, False]
+        self.stop_session()
+        self.process.close.assert_called_once_with(force=True)
+
+    def test_reset(self):
+        """
+        Tests reset() method, should be successfull while the session is running.
+        When the session is stopped, reset() should fail.
+        """
+        self.start_fake_session()
+
+        # try to reset the session
+        res = self.sw_session.reset()
+        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertTrue(self.sw_session.started, "sis session should be up and running")
+
+        # reset again
+        res = self.sw_session.reset()
+        self.assertTrue(res["success"], "action should be successfull, session can be stopped")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertTrue(self.sw_session.started, "sis session should be up and running")
+        self.assertEqual(self.spawn_mock.call_count, 3, "SIS should be started again after each reset")
+
+        # stop the session
+        self.stop_session()
+
+        # try to reset while the session is stopped
+        error = "[ERROR][RESET] Error while resetting (stop step): [ERROR][STOP] Can't stop SIS: SIS's process is not running"
+        res = self.sw_session.reset()
+        self.assertFalse(res["success"], "action should fail, session is not running")
+        self.assertIn(error, res["errors"], "there should be an error")
+
+    def test_interact(self):
+        """
+        Tests that interact() invalidates the cached results (the user's commands are not tracked).
+        """
+        self.sw_session.sis = mock.MagicMock()
+        network_version = self.sw_session.network_version
+
+        self.sw_session.interact()
+        self.sw_session.sis.interact.assert_called_once_with()
+        self.assertEqual(self.sw_session.network_version, network_version + 1)
+
+    def test_exec_batch_timeout(self):
+        """
+        Tests that the script executed by exec_batch() can last pexpect's timeout for each command.
+        """
+        self.sw_session.sis = mock.MagicMock(timeout=30)
+        exec_res = {"success": True, "errors": [], "stdout": "{0}\r\n{0}\r\n{0}".format(sw._BATCH_SEPARATOR)}
+        commands = ["state_minimize stamina", "state_assign jedi", "source script.rugged"]
+
+        with mock.patch.object(self.sw_session, "exec", return_value=exec_res) as exec_mock:
+            res = self.sw_session.exec_batch(commands)
+            self.assertTrue(res["success"], "action should be successfull")
+            self.assertEqual(exec_mock.call_args[0][1], 90)
+
+            self.sw_session.exec_batch(commands, t_timeout=5)
+            self.assertEqual(exec_mock.call_args[0][1], 5)
+
+    def test_batch_results(self):
+        """
+        Tests that batch_results() checks each output like the methods do and skips the commands SIS didn't execute.
+        """
+        commands = ["print_stats", "source script.rugged", "map -m 0 -W -s", "print_stats"]
+        stats = "and           pi= 2   po= 1   nodes=  1           latches= 0\r\nlits(sop)=   2"
+
+        # script.rugged printed something and SIS stopped the batch
+        batch_res = {"success": False, "output": [stats, "rugged error"], "stdout": None,
+                     "errors": ["[ERROR][EXEC_BATCH] SIS stopped executing the commands at 'source script.rugged'"]}
+        results = self.sw_session.batch_results(commands, batch_res)
+
+        self.assertTrue(results[0]["success"], "print_stats should be successfull")
+        self.assertEqual(results[0]["output"]["name"], "and")
+        self.assertFalse(results[1]["success"], "script.rugged should fail")
+        self.assertEqual(results[1]["errors"], batch_res["errors"])
+        self.assertEqual(results[2:], [None, None], "the commands after the failed one should be skipped")
+
+        # script.rugged printed something but SIS went on
+        batch_res = {"success": True, "output": [stats, "rugged error", None, stats], "errors": [], "stdout": None}
+        results = self.sw_session.batch_results(commands, batch_res)
+        self.assertFalse(results[1]["success"], "script.rugged should fail (like script_rugged() does)")
+        self.assertTrue(results[2]["success"], "map should be successfull")
+
+        # SIS didn't execute the batch
+        batch_res = {"success": False, "output": None, "errors": ["[ERROR][EXEC_BATCH] error"], "stdout": None}
+        results = self.sw_session.batch_results(commands, batch_res)
+        self.assertEqual(results[0]["errors"], ["[ERROR][EXEC_BATCH] error"])
+        self.assertEqual(results[1:], [None, None, None], "the other commands should be skipped")
+
+    def test_read_blif(self):
+        """
+        Tests that read_blif() splits SIS' output into errors and warnings.
+        """
+        file_path = err_blif
+        error = '"{}", line 5: bad character in PLA table'.format(file_path)
+        exec_res = {"success": True, "errors": [], "stdout": error + "\r\nWarning: network has no outputs"}
+
+        with mock.patch.object(self.sw_session, "exec", return_value=exec_res) as exec_mock:
+            res = self.sw_session.read_blif(file_path)
+
+        exec_mock.assert_called_once_with('read_blif "{}"'.format(file_path))
+        self.assertFalse(res["success"], "action should fail, file is not formatted correctly")
+        self.assertEqual(res["errors"], [error])
+        self.assertEqual(res["warnings"], ["Warning: network has no outputs"])
+        self.assertFalse(self.sw_session.readsomething, "nothing should be read")
+
+        # lines that start with other whitespace (for example a stray carriage return) are errors too
+        exec_res = {"success": True, "errors": [], "stdout": "\r" + error + "\r\n\x0c line 6\r\n\rWarning: no outputs"}
+
+        with mock.patch.object(self.sw_session, "exec", return_value=exec_res):
+            res = self.sw_session.read_blif(file_path)
+
+        self.assertFalse(res["success"], "action should fail, file is not formatted correctly")
+        self.assertEqual(res["errors"], [error, "line 6"])
+        self.assertEqual(res["warnings"], ["Warning: no outputs"])
+
+        # SIS doesn't output anything when the file is read correctly
+        file_path = and_blif
+        exec_res = {"success": True, "errors": [], "stdout": None}
+
+        with mock.patch.object(self.sw_session, "exec", return_value=exec_res):
+            res = self.sw_session.read_blif(file_path)
+
+        self.assertTrue(res["success"], "action should be successfull")
+        self.assertFalse(res["errors"], "there should be no errors")
+        self.assertTrue(self.sw_session.readsomething, "the file should be read")
+
+        # the command fails
+        exec_res = {"success": False, "errors": ["[ERROR][EXEC] error"], "stdout": None}
+
+        with mock.patch.object(self.sw_session, "exec", return_value=exec_res):
+            res = self.sw_session.read_blif(file_path, t_append=True)
+
+        self.assertFalse(res["success"], "action should fail")
+        self.assertEqual(res["errors"], ["[ERROR][READ_BLIF] Error during execution: [ERROR][EXEC] error"])
+
+        # a file that doesn't exist doesn't restart SIS (the network is kept)
+        self.sw_session.cwd = curr_dir
+        with mock.patch.object(self.sw_session, "reset") as reset_mock:
+            res = self.sw_session.read_blif(os.path.join(curr_dir, "missing", "missing.blif"))
+
+        reset_mock.assert_not_called()
+        self.assertFalse(res["success"], "action should fail, file doesn't exist")
+        self.assertEqual(self.sw_session.cwd, curr_dir, "SIS's working directory should not change")
+
+        # SIS can't be restarted inside the file's folder
+        self.sw_session.cwd = None
+        self.sw_session.read_cache = None
+        reset_res = {"success": False, "errors": ["[ERROR][RESET] error"], "stdout": None}
+
+        with mock.patch.object(self.sw_session, "reset", return_value=reset_res), \
+                mock.patch.object(self.sw_session, "exec") as exec_mock:
+            res = self.sw_session.read_blif(file_path)
+
+        exec_mock.assert_not_called()
+        self.assertFalse(res["success"], "action should fail, SIS can't be restarted")
+        self.assertEqual(res["errors"], ["[ERROR][READ_BLIF] Can't restart SIS inside the file's folder: "
+                                         "[ERROR][RESET] error"])
+        self.assertIsNone(self.sw_session.cwd, "SIS's working directory should not change")
+
+
+class TestAsyncSiswrapper(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initializes an event loop.
+        """
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_concurrent_sessions(self):
+        """
+        Tests that two AsyncSiswrapper sessions can be controlled concurrently.
+        """
+        async def read_and_stats(file_name):
+            sw_session = await sw.AsyncSiswrapper.create()
+            self.assertTrue(sw_session.siswrapper.started, "sis session should be running")
+
+            cmd_res = await sw_session.read_blif(os.path.join(curr_dir, file_name))
+            self.assertTrue(cmd_res["success"], "read_blif execution should be successfull")
+
+            cmd_res = await sw_session.print_stats()
+            executor = sw_session.executor
+            await sw_session.stop()
+            self.assertIsNone(sw_session.executor, "the worker thread should be stopped")
+            self.assertRaises(RuntimeError, executor.submit, print)  # the executor has been shut down
+            return cmd_res
+
+        async def read_both():
+            return await asyncio.gather(read_and_stats("and.blif"), read_and_stats("automa.blif"))
+
+        and_res, automa_res = self.loop.run_until_complete(read_both())
+
+        self.assertTrue(and_res["success"], "print_stats execution should be successfull")
+        self.assertEqual(and_res["output"]["name"], "and")
+        self.assertTrue(automa_res["success"], "print_stats execution should be successfull")
+        self.assertEqual(automa_res["output"]["name"], "automa")
+
+        # a stopped session can be started again
+        async def restart():
+            sw_session = await sw.AsyncSiswrapper.create()
+            await sw_session.stop()
+            start_res = await sw_session.start()
+            await sw_session.stop()
+            return start_res
+
+        self.assertTrue(self.loop.run_until_complete(restart())["success"], "sis session should start again")
+
+        # a session that was never started can't be stopped
+        res = self.loop.run_until_complete(sw.AsyncSiswrapper().stop())
+        self.assertFalse(res["success"], "action should fail, SIS's process is not running")
+        self.assertEqual(res["errors"], ["[ERROR][STOP] Can't stop SIS: SIS's process is not running"])
+
+    def test_bsisscript_fsm(self):
+        """
+        Tests that the coroutine version of bsisscript_fsm() returns the same results of the Siswrapper method.
+        """
+        async def optimize(file_path):
+            sw_session = await sw.AsyncSiswrapper.create()
+            await sw_session.read_blif(file_path)
+            async_res = await sw_session.bsisscript_fsm(autoencoding=False, opt_area=True)
+
+            await sw_session.read_blif(file_path)
+            sync_res = await sw_session.run(sw_session.siswrapper.bsisscript_fsm, autoencoding=False, opt_area=True)
+            await sw_session.stop()
+            return async_res, sync_res
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            # bsisscript_fsm() writes the partial results next to the input file
+            file_path = os.path.join(work_dir, "automa.blif")
+            shutil.copy(automa_blif, file_path)
+
+            async_res, sync_res = self.loop.run_until_complete(optimize(file_path))
+
+        self.assertEqual(async_res, sync_res, "results should be the same")
+
+
+class TestSiswrapperPool(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initializes a pool with two SIS processes.
+        """
+        self.pool = sw.SiswrapperPool(2)
+        self.assertTrue(self.pool.res["success"], "all the sis sessions should start")
+
+        for worker in self.pool.workers:
+            self.assertTrue(worker.started, "sis session should be running")
+
+    def tearDown(self):
+        res = self.pool.stop()
+        self.assertTrue(res["success"], "all the sis sessions should be stopped")
+
+    def test_init_failure(self):
+        """
+        Tests that the instances that can't start SIS are not part of the pool.
+        """
+        start_res = {"success": False, "errors": ["[ERROR][START] error"], "stdout": None}
+        with mock.patch.object(sw.Siswrapper, "start", return_value=start_res):
+            pool = sw.SiswrapperPool(2)
+
+        self.assertFalse(pool.res["success"], "the pool should report the errors")
+        self.assertEqual(len(pool.res["errors"]), 2)
+        self.assertTrue(pool.res["errors"][0].startswith("[ERROR][POOL_INIT] Error while starting a SIS process: "))
+        self.assertEqual(pool.workers, [], "no instance should be part of the pool")
+        self.assertEqual(pool.free.qsize(), 0, "no instance should be free")
+        self.assertRaises(Exception, pool.submit, lambda sw_session: None)
+        pool.stop()
+
+    def test_map(self):
+        """
+        Tests that map() executes a job for each file and returns the results in order.
+        """
+        def stats(sw_session, file_name):
+            sw_session.read_blif(os.path.join(curr_dir, file_name))
+            return sw_session.print_stats()
+
+        results = self.pool.map(stats, ["and.blif", "automa.blif", "and.blif"])
+
+        self.assertEqual([res["output"]["name"] for res in results], ["and", "automa", "and"])
+
+    def test_acquire(self):
+        """
+        Tests that acquire() gives a free instance and gives it back at the end of the with block.
+        """
+        with self.pool.acquire() as sw_session:
+            self.assertEqual(self.pool.free.qsize(), 1, "the instance should not be free")
+            res = sw_session.read_blif(and_blif)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+            sw_session.partial_suffix = ".job"
+
+        self.assertEqual(self.pool.free.qsize(), 2, "the instance should be free again")
+
+        # the next job doesn't see the state of the previous job, but it uses the same SIS process
+        self.assertTrue(sw_session.started, "sis session should be running")
+        self.assertFalse(sw_session.readsomething, "nothing should be read")
+        self.assertIsNone(sw_session.read_cache, "the read cache should be empty")
+        self.assertEqual(sw_session.partial_suffix, "")
+        self.assertEqual(sw_session.cwd, curr_dir, "SIS should stay in the folder of the last read file")
+
+        process = sw_session.sis
+        with mock.patch.object(sw_session, "reset") as reset_mock:
+            res = sw_session.read_blif(and_blif)
+            self.assertTrue(res["success"], "read_blif execution should be successfull")
+            reset_mock.assert_not_called()
+        self.assertIs(sw_session.sis, process, "SIS should not be restarted")
+
+        # the job stops SIS
+        with self.pool.acquire() as sw_session:
+            sw_session.stop()
+
+        self.assertTrue(sw_session.started, "sis session should be running again")
+
+        # SIS can't be started again: the instance is removed from the pool
+        with mock.patch.object(sw.Siswrapper, "start", return_value={"success": False, "errors": [], "stdout": None}):
+            with self.pool.acquire() as sw_session:
+                sw_session.stop()
+
+        self.assertNotIn(sw_session, self.pool.workers, "the stopped instance should be removed")
+        self.assertEqual(self.pool.free.qsize(), 1, "only the running instance should be free")
+
+    def test_run_dual(self):
+        """
+        Tests that run_dual() optimizes an FSM both for area and for delay.
+        """
+        with tempfile.TemporaryDirectory() as work_dir:
+            file_path = os.path.join(work_dir, "automa.blif")
+            shutil.copy(automa_blif, file_path)
+
+            res = sw.Siswrapper.run_dual(file_path, autoencoding=False)
+
+            self.assertTrue(res["area"]["success"], "area optimization should be successfull")
+            self.assertTrue(res["delay"]["success"], "delay optimization should be successfull")
+            self.assertNotIn("3_reduce_depth_stats", res["area"]["output"])
+            self.assertIn("3_reduce_depth_stats", res["delay"]["output"])
+            self.assertTrue(os.path.isfile(os.path.join(work_dir, "automa.area.mapped.blif")))
+            self.assertTrue(os.path.isfile(os.path.join(work_dir, "automa.delay.mapped.blif")))
+
+
 if __name__ == "__main__":
-    unittest.main()
+    try:
+        # run the whole suite in parallel when pytest-xdist is installed,
+        # idle workers steal the pending tests of the slow SIS test classes (pytest-xdist >= 3.2)
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        pytest = None
+
+    if pytest is None or len(sys.argv) > 1:
+        # the arguments select the tests to run, for example the tests that don't need SIS:
+        # python tests/unit_tests.py TestUtils TestSiswrapperMocked
+        unittest.main()
+    else:
+        sys.exit(pytest.main([__file__, "-n", "auto", "--dist=worksteal"]))